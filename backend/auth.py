@@ -1,6 +1,15 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
+from cachetools import TTLCache
 from jose import JWTError, jwt
+from jose.exceptions import JWTClaimsError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -14,6 +23,15 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # Security scheme
 security = HTTPBearer()
 
+# Cache of already-verified tokens, keyed by a SHA-256 prefix of the token
+# (the raw token is never stored). Values are (username, exp).
+_token_cache = TTLCache(maxsize=10000, ttl=settings.ACCESS_TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
+# HMAC-SHA256 keyed with SECRET_KEY once at import; verification copies it
+# instead of re-running the key schedule for every request
+_hs256_prototype = hmac.new(settings.SECRET_KEY.encode(), digestmod=hashlib.sha256)
+
 
 class Token(BaseModel):
     access_token: str
@@ -54,6 +72,61 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _decode_hs256(token: str) -> dict:
+    """Verify an HS256 JWT's signature and claims and return its payload.
+
+    Hot-path replacement for jwt.decode; tokens are still issued by python-jose.
+    Claims are checked the way jwt.decode checks them when no audience,
+    issuer or subject is expected.
+    """
+    if token.count(".") != 2:
+        raise JWTError("Not enough segments")
+
+    signing_input, _, signature_segment = token.rpartition(".")
+    header_segment, _, payload_segment = signing_input.partition(".")
+
+    try:
+        header = json.loads(_b64url_decode(header_segment))
+        if not isinstance(header, dict) or header.get("alg") != "HS256":
+            raise JWTError("The specified alg value is not allowed")
+
+        mac = _hs256_prototype.copy()
+        mac.update(signing_input.encode())
+        if not hmac.compare_digest(mac.digest(), _b64url_decode(signature_segment)):
+            raise JWTError("Signature verification failed")
+
+        payload = json.loads(_b64url_decode(payload_segment))
+    except (ValueError, binascii.Error) as e:
+        raise JWTError(f"Invalid token: {e}")
+
+    if not isinstance(payload, dict):
+        raise JWTError("Invalid payload")
+
+    now = time.time()
+    try:
+        if "exp" in payload and float(payload["exp"]) <= now:
+            raise JWTError("Signature has expired")
+        if "nbf" in payload and float(payload["nbf"]) > now:
+            raise JWTError("The token is not yet valid (nbf)")
+    except (TypeError, ValueError):
+        raise JWTError("Invalid time claim")
+
+    if "iat" in payload and (isinstance(payload["iat"], bool) or not isinstance(payload["iat"], (int, float))):
+        raise JWTClaimsError("Issued At claim (iat) must be an integer.")
+    if "aud" in payload:
+        raise JWTClaimsError("Invalid audience")
+    for claim in ("sub", "jti"):
+        if claim in payload and not isinstance(payload[claim], str):
+            raise JWTClaimsError(f"{claim} must be a string.")
+
+    return payload
+
+
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> TokenData:
     """Verify JWT token from request."""
     credentials_exception = HTTPException(
@@ -62,9 +135,20 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    token = credentials.credentials
+    cache_key = hashlib.sha256(token.encode()).digest()[:16]
+
+    # Fast path: token was verified recently and has not expired since
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None and cached[1] > time.time():
+        return TokenData(username=cached[0])
+
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if settings.ALGORITHM == "HS256":
+            payload = _decode_hs256(token)
+        else:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
@@ -72,6 +156,11 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
     except JWTError:
         raise credentials_exception
 
+    exp = payload.get("exp")
+    if exp is not None:
+        with _token_cache_lock:
+            _token_cache[cache_key] = (username, float(exp))
+
     return token_data
 
 
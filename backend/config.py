@@ -1,3 +1,4 @@
+from functools import cached_property
 from pydantic_settings import BaseSettings
 from pathlib import Path
 
@@ -7,6 +8,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+    ACCESS_TOKEN_CACHE_TTL: int = 30  # Seconds a verified token is cached
 
     # Admin credentials
     ADMIN_PASSWORD: str
@@ -14,7 +16,20 @@ class Settings(BaseSettings):
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    RELOAD: bool = False  # Auto-reload for development (single worker)
+    THREADPOOL_TOKENS: int = 128  # Max concurrent blocking handlers/file operations
+    # Uvicorn worker processes. Caches and the login rate limit live in each
+    # process, so with more than one a write may not show up in another
+    # worker's listings right away and the rate limit is per worker
+    WORKERS: int = 1
     
+    # Uploads
+    MAX_UPLOAD_SIZE_MB: int = 2048
+
+    # Reverse-proxy file offload (nginx X-Accel-Redirect)
+    USE_X_ACCEL: bool = False
+    INTERNAL_FILES_PREFIX: str = "/_internal_files/"  # Internal location aliased to DATA_DIR
+
     # Frontend CORS
     FRONTEND_URL: str = "http://localhost:3000"  # Default for development
 
@@ -27,10 +42,17 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
 
-    def get_models_path(self) -> Path:
+    # Resolved once on first access instead of calling realpath every time
+    @cached_property
+    def data_path(self) -> Path:
+        return Path(self.DATA_DIR).resolve()
+
+    @cached_property
+    def models_path(self) -> Path:
         return Path(self.MODELS_DIR).resolve()
 
-    def get_trajectories_path(self) -> Path:
+    @cached_property
+    def trajectories_path(self) -> Path:
         return Path(self.TRAJECTORIES_DIR).resolve()
 
 
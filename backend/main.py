@@ -1,5 +1,14 @@
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Request
-from fastapi.responses import FileResponse
+import aiofiles
+import aiofiles.os
+import anyio
+import os
+from contextlib import suppress
+from email.utils import formatdate, parsedate_to_datetime
+from functools import partial
+from pathlib import Path, PurePosixPath
+from urllib.parse import quote
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import timedelta
 from typing import Optional, List
@@ -21,13 +30,14 @@ from models import (
     ModelListResponse,
     ErrorResponse
 )
-from storage import storage
+from storage import storage, file_version, UnsafePathError, TRAJECTORY_EXTENSIONS, MODEL_EXTENSIONS
 
 
 app = FastAPI(
     title="Motion Library API",
     description="API for managing and visualizing robot motion trajectories",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Rate limiter setup
@@ -35,6 +45,18 @@ limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Handlers that touch the filesystem (storage.*) are plain `def` so Starlette
+# runs them in its threadpool. Handlers that must stay `async` (e.g. to await
+# the upload body) offload blocking storage calls via anyio.to_thread.run_sync.
+# Never call storage directly from an `async def` handler.
+
+
+@app.on_event("startup")
+async def _tune_threadpool():
+    """Size the threadpool used by `def` handlers and run_sync offloads."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_TOKENS
+
+
 # CORS middleware for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -45,6 +67,212 @@ app.add_middleware(
 )
 
 
+# Precomputed liveness response served without routing or serialization
+_HEALTH_BODY = b'{"status":"healthy"}'
+_HEALTH_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_HEALTH_BODY)).encode()),
+]
+
+
+class HealthMiddleware:
+    """Answer GET /health directly at the ASGI layer.
+
+    Liveness probes hit this endpoint constantly; the /health route below is
+    kept only so it still appears in the API docs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/health" and scope["method"] == "GET":
+            await send({"type": "http.response.start", "status": 200, "headers": _HEALTH_HEADERS})
+            await send({"type": "http.response.body", "body": _HEALTH_BODY})
+            return
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(HealthMiddleware)
+
+
+async def _receive_to_file(request: Request, dest: Path) -> None:
+    """Stream the raw request body to `dest` via a temporary .part file.
+
+    The size limit is enforced on the bytes actually received, since a
+    chunked body carries no Content-Length to check up front.
+    """
+    part_path = dest.with_name(dest.name + ".part")
+    limit = _max_upload_bytes()
+    received = 0
+    try:
+        async with aiofiles.open(part_path, "wb") as f:
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > limit:
+                    raise _upload_too_large()
+                await f.write(chunk)
+        await aiofiles.os.replace(part_path, dest)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            await aiofiles.os.remove(part_path)
+        raise
+
+
+# Media types for served files, keyed by lowercase suffix
+_MEDIA_TYPES = {
+    ".xml": "application/xml",
+    ".stl": "model/stl",
+    ".obj": "model/mesh",
+    ".dae": "model/mesh",
+    ".mesh": "model/mesh",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".svg": "image/svg+xml",
+}
+
+
+def _validate_extension(filename: Optional[str], allowed: frozenset) -> str:
+    """Check an upload's lowercased suffix against the allowed set and return it."""
+    suffix = PurePosixPath(filename or "").suffix.lower()
+    if suffix not in allowed:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Only {' and '.join(sorted(allowed))} files are supported"
+        )
+    return suffix
+
+
+def _max_upload_bytes() -> int:
+    """The configured upload size limit in bytes."""
+    return settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+
+
+def _upload_too_large() -> HTTPException:
+    """The 413 raised for uploads over the limit."""
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large (max {settings.MAX_UPLOAD_SIZE_MB} MB)"
+    )
+
+
+def _check_upload_size(request: Request) -> None:
+    """Reject uploads whose declared Content-Length exceeds the configured limit."""
+    content_length = request.headers.get("content-length")
+    if content_length and int(content_length) > _max_upload_bytes():
+        raise _upload_too_large()
+
+
+def _check_spooled_size(file: UploadFile) -> None:
+    """Reject a parsed multipart upload whose received size exceeds the limit.
+
+    Content-Length may be missing (chunked) or understated, so the check
+    that counts is on the bytes the multipart parser actually spooled.
+    """
+    spooled = file.file
+    spooled.seek(0, os.SEEK_END)
+    size = spooled.tell()
+    spooled.seek(0)
+    if size > _max_upload_bytes():
+        raise _upload_too_large()
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Check the request's conditional headers against the file's validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
+def _accel_redirect_response(path: Path, media_type: str, filename: Optional[str], headers: dict) -> Optional[Response]:
+    """Hand the file off to the reverse proxy via X-Accel-Redirect.
+
+    Returns None if the file lives outside DATA_DIR and cannot be mapped
+    onto the proxy's internal location.
+    """
+    try:
+        rel_path = path.relative_to(storage.base_path)
+    except ValueError:
+        return None
+
+    accel_headers = {
+        **headers,
+        "X-Accel-Redirect": settings.INTERNAL_FILES_PREFIX + quote(rel_path.as_posix()),
+    }
+    if filename:
+        quoted_filename = quote(filename)
+        if quoted_filename != filename:
+            accel_headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quoted_filename}"
+        else:
+            accel_headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    return Response(media_type=media_type, headers=accel_headers)
+
+
+def _validators(stat_result, headers: Optional[dict]) -> dict:
+    """ETag/Last-Modified for a stat result, plus any extra response headers."""
+    validators = {
+        "ETag": f'"{file_version(stat_result)}"',
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+    }
+    if headers:
+        validators.update(headers)
+    return validators
+
+
+def _file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    filename: Optional[str] = None,
+    headers: Optional[dict] = None,
+    offload: bool = False
+) -> Response:
+    """Serve a file with ETag/Last-Modified, answering 304 when the client copy is current.
+
+    With offload=True and USE_X_ACCEL enabled, the body is sent by the
+    reverse proxy instead of being streamed through Python.
+    """
+    # The short-lived cached stat is enough to answer conditional requests
+    stat_result = storage.stat_file(path)
+    validators = _validators(stat_result, headers)
+
+    if _not_modified(request, validators["ETag"], stat_result.st_mtime):
+        return Response(status_code=304, headers=validators)
+
+    # A full response needs the file as it is now: FileResponse takes
+    # Content-Length from stat_result, and a cached one may predate a
+    # replacement of the file (possibly by another worker)
+    stat_result = path.stat()
+    validators = _validators(stat_result, headers)
+
+    if offload and settings.USE_X_ACCEL:
+        response = _accel_redirect_response(path, media_type, filename, validators)
+        if response is not None:
+            return response
+
+    return FileResponse(
+        path=path,
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result,
+        headers=validators
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -61,6 +289,11 @@ async def health():
     return {"status": "healthy"}
 
 
+# Authenticated API routes: the token check is declared once on the router
+# instead of on every handler
+api = APIRouter(prefix="/api", dependencies=[Depends(get_current_user)])
+
+
 # Authentication endpoints
 @app.post("/api/auth/login", response_model=Token)
 @limiter.limit("5/5minutes")  # 5 attempts per 5 minutes per IP
@@ -81,73 +314,82 @@ async def login(request: Request, login_request: LoginRequest):
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@app.post("/api/auth/verify")
+@api.post("/auth/verify")
 async def verify(current_user: str = Depends(get_current_user)):
     """Verify token is valid."""
     return {"valid": True, "user": current_user}
 
 
 # Trajectory endpoints
-@app.get("/api/trajectories", response_model=TrajectoryListResponse)
-async def list_trajectories(
-    category: Optional[str] = None,
-    current_user: str = Depends(get_current_user)
-):
-    """List all trajectories."""
+@api.get("/trajectories", response_model=TrajectoryListResponse)
+def list_trajectories(category: Optional[str] = None, format: Optional[str] = None):
+    """List all trajectories.
+
+    With format=ndjson the trajectories are streamed one JSON object per line
+    as they are scanned instead of as a single JSON envelope. Stream order is
+    unspecified: a cached listing replays newest-first, a fresh scan streams
+    in walk order.
+    """
+    if format == "ndjson":
+        return StreamingResponse(
+            (t.model_dump_json().encode() + b"\n" for t in storage.iter_trajectories(category)),
+            media_type="application/x-ndjson"
+        )
+
     trajectories = storage.list_trajectories(category=category)
-    return TrajectoryListResponse(
-        trajectories=trajectories,
-        total=len(trajectories)
-    )
+    # Serialize in pydantic-core instead of re-validating through response_model
+    response = TrajectoryListResponse(trajectories=trajectories, total=len(trajectories))
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 
-@app.get("/api/trajectories/{trajectory_id}")
-async def get_trajectory(
-    trajectory_id: str,
-    current_user: str = Depends(get_current_user)
+@api.get("/trajectories/{trajectory_id}")
+def get_trajectory(
+    request: Request,
+    trajectory_id: str
 ):
     """Download a trajectory file."""
     file_path = storage.get_trajectory(trajectory_id)
     if not file_path:
         raise HTTPException(status_code=404, detail="Trajectory not found")
 
-    return FileResponse(
-        path=file_path,
+    return _file_response(
+        request,
+        file_path,
         media_type="application/octet-stream",
-        filename=file_path.name
+        filename=file_path.name,
+        offload=True
     )
 
 
-@app.post("/api/trajectories", response_model=TrajectoryUploadResponse)
+@api.post("/trajectories", response_model=TrajectoryUploadResponse)
 async def upload_trajectory(
+    request: Request,
     file: UploadFile = File(...),
-    category: Optional[str] = Form(None),
-    current_user: str = Depends(get_current_user)
+    category: Optional[str] = Form(None)
 ):
     """Upload a new trajectory file."""
     # Validate file extension
-    if not file.filename.endswith(('.npy', '.npz')):
-        raise HTTPException(
-            status_code=400,
-            detail="Only .npy and .npz files are supported"
-        )
+    _validate_extension(file.filename, TRAJECTORY_EXTENSIONS)
 
-    # Read file content
-    content = await file.read()
+    _check_upload_size(request)
+    _check_spooled_size(file)
 
     try:
-        # Save trajectory
-        trajectory = storage.save_trajectory(
+        # Stream the spooled upload to disk without buffering it in memory
+        trajectory = await anyio.to_thread.run_sync(partial(
+            storage.save_trajectory,
             filename=file.filename,
-            content=content,
+            source=file.file,
             category=category
-        )
+        ))
 
         return TrajectoryUploadResponse(
             success=True,
             message="Trajectory uploaded successfully",
             trajectory=trajectory
         )
+    except UnsafePathError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -155,11 +397,44 @@ async def upload_trajectory(
         )
 
 
-@app.delete("/api/trajectories/{trajectory_id}")
-async def delete_trajectory(
-    trajectory_id: str,
-    current_user: str = Depends(get_current_user)
+@api.put("/trajectories/{filename}", response_model=TrajectoryUploadResponse)
+async def stream_upload_trajectory(
+    request: Request,
+    filename: str,
+    category: Optional[str] = None
 ):
+    """Upload a trajectory sent as a raw application/octet-stream body.
+
+    Skips multipart parsing so large files are written to disk as they arrive.
+    """
+    # Validate file extension
+    _validate_extension(filename, TRAJECTORY_EXTENSIONS)
+
+    _check_upload_size(request)
+
+    try:
+        file_path = await anyio.to_thread.run_sync(storage.trajectory_path, filename, category)
+        await _receive_to_file(request, file_path)
+        trajectory = await anyio.to_thread.run_sync(storage.register_trajectory, file_path, category)
+
+        return TrajectoryUploadResponse(
+            success=True,
+            message="Trajectory uploaded successfully",
+            trajectory=trajectory
+        )
+    except HTTPException:
+        raise
+    except UnsafePathError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to upload trajectory: {str(e)}"
+        )
+
+
+@api.delete("/trajectories/{trajectory_id}")
+def delete_trajectory(trajectory_id: str):
     """Delete a trajectory file."""
     if storage.delete_trajectory(trajectory_id):
         return {"success": True, "message": "Trajectory deleted successfully"}
@@ -168,63 +443,63 @@ async def delete_trajectory(
 
 
 # Model endpoints
-@app.get("/api/models", response_model=ModelListResponse)
-async def list_models(current_user: str = Depends(get_current_user)):
+@api.get("/models", response_model=ModelListResponse)
+def list_models():
     """List all models."""
     models = storage.list_models()
-    return ModelListResponse(
-        models=models,
-        total=len(models)
-    )
+    # Serialize in pydantic-core instead of re-validating through response_model
+    response = ModelListResponse(models=models, total=len(models))
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 
-@app.get("/api/models/{model_id}")
-async def get_model(
-    model_id: str,
-    current_user: str = Depends(get_current_user)
+@api.get("/models/{model_id}")
+def get_model(
+    request: Request,
+    model_id: str
 ):
     """Download a model file."""
     file_path = storage.get_model(model_id)
     if not file_path:
         raise HTTPException(status_code=404, detail="Model not found")
 
-    return FileResponse(
-        path=file_path,
+    return _file_response(
+        request,
+        file_path,
         media_type="application/xml",
-        filename=file_path.name
+        filename=file_path.name,
+        offload=True
     )
 
 
-@app.post("/api/models")
+@api.post("/models")
 async def upload_model(
+    request: Request,
     file: UploadFile = File(...),
-    model_name: Optional[str] = Form(None),
-    current_user: str = Depends(get_current_user)
+    model_name: Optional[str] = Form(None)
 ):
     """Upload a new model file."""
     # Validate file extension
-    if not file.filename.endswith('.xml'):
-        raise HTTPException(
-            status_code=400,
-            detail="Only .xml files are supported"
-        )
+    _validate_extension(file.filename, MODEL_EXTENSIONS)
 
-    # Read file content
-    content = await file.read()
+    _check_upload_size(request)
+    _check_spooled_size(file)
 
     try:
-        # Save model
-        model = storage.save_model(
+        # Stream the spooled upload to disk without buffering it in memory
+        model = await anyio.to_thread.run_sync(partial(
+            storage.save_model,
             filename=file.filename,
-            content=content,
+            source=file.file,
             model_name=model_name
-        )
+        ))
 
         return {
             "success": True,
             "message": "Model uploaded successfully",
             "model": model
         }
+    except UnsafePathError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -232,11 +507,41 @@ async def upload_model(
         )
 
 
-@app.delete("/api/models/{model_id}")
-async def delete_model(
-    model_id: str,
-    current_user: str = Depends(get_current_user)
+@api.put("/models/{filename}")
+async def stream_upload_model(
+    request: Request,
+    filename: str,
+    model_name: Optional[str] = None
 ):
+    """Upload a model file sent as a raw application/octet-stream body."""
+    # Validate file extension
+    _validate_extension(filename, MODEL_EXTENSIONS)
+
+    _check_upload_size(request)
+
+    try:
+        file_path = await anyio.to_thread.run_sync(storage.model_path, filename, model_name)
+        await _receive_to_file(request, file_path)
+        model = await anyio.to_thread.run_sync(storage.register_model, file_path, model_name)
+
+        return {
+            "success": True,
+            "message": "Model uploaded successfully",
+            "model": model
+        }
+    except HTTPException:
+        raise
+    except UnsafePathError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to upload model: {str(e)}"
+        )
+
+
+@api.delete("/models/{model_id}")
+def delete_model(model_id: str):
     """Delete a model file."""
     if storage.delete_model(model_id):
         return {"success": True, "message": "Model deleted successfully"}
@@ -244,11 +549,8 @@ async def delete_model(
         raise HTTPException(status_code=404, detail="Model not found")
 
 
-@app.get("/api/models/{model_id}/files")
-async def list_model_files(
-    model_id: str,
-    current_user: str = Depends(get_current_user)
-):
+@api.get("/models/{model_id}/files")
+def list_model_files(model_id: str):
     """List all files in a model's directory."""
     files = storage.get_model_directory_files(model_id)
     if not files:
@@ -256,11 +558,11 @@ async def list_model_files(
     return {"files": files}
 
 
-@app.get("/api/models/{model_id}/files/{file_path:path}")
-async def get_model_file(
+@api.get("/models/{model_id}/files/{file_path:path}")
+def get_model_file(
+    request: Request,
     model_id: str,
-    file_path: str,
-    current_user: str = Depends(get_current_user)
+    file_path: str
 ):
     """Get a specific file from a model's directory."""
     file_abs_path = storage.get_file_in_model_directory(model_id, file_path)
@@ -268,96 +570,71 @@ async def get_model_file(
         raise HTTPException(status_code=404, detail="File not found in model directory")
 
     # Determine media type based on file extension
-    media_type = "application/octet-stream"
-    suffix = file_abs_path.suffix.lower()
-    
-    if suffix == '.xml':
-        media_type = "application/xml"
-    elif suffix == '.stl':
-        media_type = "model/stl"
-    elif suffix in ['.obj', '.dae', '.mesh']:
-        media_type = "model/mesh"
-    elif suffix == '.png':
-        media_type = "image/png"
-    elif suffix in ['.jpg', '.jpeg']:
-        media_type = "image/jpeg"
-    elif suffix == '.gif':
-        media_type = "image/gif"
-    elif suffix == '.webp':
-        media_type = "image/webp"
-    elif suffix == '.svg':
-        media_type = "image/svg+xml"
+    media_type = _MEDIA_TYPES.get(file_abs_path.suffix.lower(), "application/octet-stream")
 
-    return FileResponse(
-        path=file_abs_path,
+    return _file_response(
+        request,
+        file_abs_path,
         media_type=media_type,
-        filename=file_abs_path.name
+        filename=file_abs_path.name,
+        offload=True
     )
 
 
 # Thumbnail endpoints
-@app.get("/api/models/{model_id}/thumbnail")
-async def get_model_thumbnail(
-    model_id: str,
-    current_user: str = Depends(get_current_user)
-):
-    """Get thumbnail image for a model."""
-    print(f"[THUMBNAIL] Model thumbnail request: model_id={model_id}")
-    thumbnail_path = storage.get_model_thumbnail(model_id)
+def _thumbnail_response(request: Request, kind: str, item_id: str, lookup) -> Response:
+    """Look up and serve a model or trajectory thumbnail.
+
+    Requests that carry the current thumbnail_version as ?v= get an immutable
+    cache lifetime: a regenerated thumbnail gets a new version and thus a
+    new URL, so browsers never need to revalidate.
+    """
+    print(f"[THUMBNAIL] {kind} thumbnail request: id={item_id}")
+    thumbnail_path = lookup(item_id)
     if not thumbnail_path:
-        print(f"[THUMBNAIL] Model thumbnail not found for id={model_id}")
+        print(f"[THUMBNAIL] {kind} thumbnail not found for id={item_id}")
         raise HTTPException(status_code=404, detail="Thumbnail not found")
 
-    print(f"[THUMBNAIL] Model thumbnail found: {thumbnail_path}")
-
     # Determine media type based on extension
-    media_type = "image/webp"
-    if thumbnail_path.suffix == ".png":
-        media_type = "image/png"
-    elif thumbnail_path.suffix == ".jpg":
-        media_type = "image/jpeg"
-    elif thumbnail_path.suffix == ".gif":
-        media_type = "image/gif"
+    media_type = _MEDIA_TYPES.get(thumbnail_path.suffix.lower(), "image/webp")
 
-    print(f"[THUMBNAIL] Serving with media_type={media_type}")
+    print(f"[THUMBNAIL] Serving {thumbnail_path} with media_type={media_type}")
 
-    return FileResponse(
-        path=thumbnail_path,
+    requested_version = request.query_params.get("v")
+    # Checked against a fresh stat so a just-replaced thumbnail is never
+    # served as immutable under its old version
+    if requested_version and requested_version == file_version(thumbnail_path.stat()):
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        cache_control = "public, max-age=3600"
+
+    return _file_response(
+        request,
+        thumbnail_path,
         media_type=media_type,
-        headers={"Cache-Control": "public, max-age=3600"}
+        headers={"Cache-Control": cache_control}
     )
 
 
-@app.get("/api/trajectories/{trajectory_id}/thumbnail")
-async def get_trajectory_thumbnail(
-    trajectory_id: str,
-    current_user: str = Depends(get_current_user)
+@api.get("/models/{model_id}/thumbnail")
+def get_model_thumbnail(
+    request: Request,
+    model_id: str
 ):
-    """Get thumbnail animation for a trajectory."""
-    print(f"[THUMBNAIL] Trajectory thumbnail request: trajectory_id={trajectory_id}")
-    thumbnail_path = storage.get_trajectory_thumbnail(trajectory_id)
-    if not thumbnail_path:
-        print(f"[THUMBNAIL] Trajectory thumbnail not found for id={trajectory_id}")
-        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    """Get thumbnail image for a model."""
+    return _thumbnail_response(request, "Model", model_id, storage.get_model_thumbnail)
 
-    print(f"[THUMBNAIL] Trajectory thumbnail found: {thumbnail_path}")
 
-    # Determine media type based on extension
-    media_type = "image/webp"
-    if thumbnail_path.suffix == ".gif":
-        media_type = "image/gif"
-    elif thumbnail_path.suffix == ".png":
-        media_type = "image/png"
-    elif thumbnail_path.suffix == ".jpg":
-        media_type = "image/jpeg"
+@api.get("/trajectories/{trajectory_id}/thumbnail")
+def get_trajectory_thumbnail(
+    request: Request,
+    trajectory_id: str
+):
+    """Get thumbnail animation for a trajectory."""
+    return _thumbnail_response(request, "Trajectory", trajectory_id, storage.get_trajectory_thumbnail)
 
-    print(f"[THUMBNAIL] Serving with media_type={media_type}")
 
-    return FileResponse(
-        path=thumbnail_path,
-        media_type=media_type,
-        headers={"Cache-Control": "public, max-age=3600"}
-    )
+app.include_router(api)
 
 
 if __name__ == "__main__":
@@ -366,5 +643,10 @@ if __name__ == "__main__":
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=True
+        reload=settings.RELOAD,
+        # uvloop + httptools in production; reload mode needs a single worker
+        loop="asyncio" if settings.RELOAD else "uvloop",
+        http="httptools",
+        workers=1 if settings.RELOAD else settings.WORKERS,
+        access_log=False
     )
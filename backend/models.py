@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -8,6 +8,8 @@ class LoginRequest(BaseModel):
 
 
 class TrajectoryMetadata(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     id: str
     filename: str
     category: Optional[str] = None
@@ -17,6 +19,7 @@ class TrajectoryMetadata(BaseModel):
     frame_rate: Optional[float] = None
     num_joints: Optional[int] = None
     thumbnail_path: Optional[str] = None
+    thumbnail_version: Optional[str] = None  # Changes whenever the thumbnail file changes
 
 
 class TrajectoryUploadResponse(BaseModel):
@@ -26,11 +29,15 @@ class TrajectoryUploadResponse(BaseModel):
 
 
 class TrajectoryListResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     trajectories: List[TrajectoryMetadata]
     total: int
 
 
 class ModelMetadata(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     id: str
     filename: str
     model_name: Optional[str] = None  # Model directory name (e.g., "MS-Human-700")
@@ -38,9 +45,12 @@ class ModelMetadata(BaseModel):
     file_size: int
     upload_date: datetime
     thumbnail_path: Optional[str] = None
+    thumbnail_version: Optional[str] = None  # Changes whenever the thumbnail file changes
 
 
 class ModelListResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     models: List[ModelMetadata]
     total: int
 
@@ -5,6 +5,7 @@ Generate thumbnails for models and animated WebP for trajectories.
 This script uses subcommands to separate model and trajectory rendering:
 - render-model: Generate thumbnail for ONE specific model
 - render-trajectory: Generate animation for trajectory(ies) with a specific model
+- migrate-ids: Rename thumbnails created before file IDs switched from MD5 to BLAKE2b
 
 Usage:
     # Render a model thumbnail
@@ -18,15 +19,35 @@ Usage:
 
     # Render all trajectories in a folder
     python scripts/generate_thumbnails.py render-trajectory --trajectory "locomotion/" --model "MS-Human-700/MS-Human-700-MJX.xml"
+
+    # Rename existing thumbnails after upgrading from MD5 file IDs
+    python scripts/generate_thumbnails.py migrate-ids
 """
 
+from __future__ import annotations
+
 import argparse
+import atexit
+import cProfile
 import hashlib
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple
-import numpy as np
-import mujoco
-from PIL import Image
+from typing import TYPE_CHECKING, Tuple
+
+# mujoco (C library + GL probing), numpy and PIL are imported where they are
+# used, so --help, argument errors and bad paths exit without loading them
+if TYPE_CHECKING:
+    import mujoco
+    import numpy as np
+
+# Source file extensions (compared against the lowercased suffix, as the backend does)
+MODEL_EXTENSIONS = frozenset({".xml"})
+TRAJECTORY_EXTENSIONS = frozenset({".npy", ".npz"})
 
 # Configuration
 THUMBNAIL_SIZE = (320, 320)  # Small web-optimized size
@@ -41,10 +62,73 @@ DEFAULT_CAMERA_LOOKAT = [0, 0, 1]  # Point to look at [x, y, z]
 TRAJECTORY_FRAMES = 30  # Number of frames in animation
 ANIMATION_DURATION = 100  # ms per frame (10 fps)
 
+# WebP encoder settings
+# method 4 / quality 80 is within a few percent of method 6 / quality 85 in
+# size on 320x320 renders, at a fraction of the encode time
+WEBP_QUALITY = 80  # 0-100, lossy quality factor
+WEBP_METHOD = 4  # 0 (fastest) - 6 (slowest, smallest)
+
+# Rendered trajectories allowed to wait for the background encoder (bounds memory)
+ENCODE_QUEUE_DEPTH = 2
+
+# Parallel folder rendering (each worker holds its own model + GL context)
+DEFAULT_JOBS = max(1, (os.cpu_count() or 2) // 2)
+
+
+def pose_for_render(model: mujoco.MjModel, data: mujoco.MjData):
+    """Compute only what the renderer reads for the pose in data.qpos
+
+    Rendering needs body/geom/site poses, camera and light placement, flex
+    vertex positions and tendon paths. That is a subset of mj_forward, which
+    also runs collision detection, constraint assembly and dynamics for
+    every frame. The calls follow mj_fwdPosition's order.
+    """
+    import mujoco
+
+    mujoco.mj_kinematics(model, data)
+    mujoco.mj_comPos(model, data)
+    mujoco.mj_camlight(model, data)
+    mujoco.mj_flex(model, data)
+    mujoco.mj_tendon(model, data)
+
+
+def save_image(image, output_path: Path, format: str, **save_kwargs):
+    """Save an image by writing a temporary file and renaming it over output_path
+
+    Replacing the directory entry bumps the directory's mtime, which the
+    backend's listing cache watches; rewriting the thumbnail in place would
+    leave listings advertising the old thumbnail_version.
+    """
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    try:
+        image.save(tmp_path, format, **save_kwargs)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
 
 class ThumbnailGenerator:
-    def __init__(self, data_dir: Path):
+    def __init__(
+        self,
+        data_dir: Path,
+        webp_quality: int = WEBP_QUALITY,
+        webp_method: int = WEBP_METHOD,
+        force: bool = False,
+        profile: bool = False
+    ):
         self.data_dir = data_dir
+        self.webp_quality = webp_quality
+        self.webp_method = webp_method
+        self.force = force  # Re-render even if a thumbnail is up to date
+        self.profile = profile  # Report per-phase timings for each render
+        self._phase_ns = None  # Phase name -> accumulated ns while profiling a render
+        self._encoder = None  # Background WebP encode thread, created on first use
+        self._pending_encodes = deque()
+        self._encode_failures = 0
+        self._models = {}  # model path -> compiled MjModel
+        self._renderers = {}  # (id(model), height, width) -> (model, Renderer)
+        self._cameras = {}  # (id(model), camera params) -> (model, camera id or MjvCamera)
         self.models_dir = data_dir / "models"
         self.trajectories_dir = data_dir / "trajectories"
         self.thumbnails_dir = data_dir / "thumbnails"
@@ -54,72 +138,351 @@ class ThumbnailGenerator:
         (self.thumbnails_dir / "trajectories").mkdir(parents=True, exist_ok=True)
 
     def get_file_id(self, relative_path: str) -> str:
-        """Generate MD5 hash ID for file (matches backend logic)
+        """Generate BLAKE2b hash ID for file (matches backend logic)
 
         Args:
             relative_path: Path relative to models/ or trajectories/ directory
                           e.g., "MS-Human-700/MS-Human-700-MJX.xml"
         """
+        return hashlib.blake2b(relative_path.encode(), digest_size=8).hexdigest()
+
+    def get_legacy_file_id(self, relative_path: str) -> str:
+        """Generate the MD5-based ID used before the switch to BLAKE2b"""
         return hashlib.md5(relative_path.encode()).hexdigest()[:16]
 
-    def render_with_camera(
+    def migrate_thumbnail_ids(self) -> int:
+        """Rename thumbnails named by legacy MD5 IDs to the current IDs
+
+        Returns:
+            Number of thumbnails renamed
+        """
+        renamed = 0
+        for kind, source_dir, extensions in (
+            ("models", self.models_dir, MODEL_EXTENSIONS),
+            ("trajectories", self.trajectories_dir, TRAJECTORY_EXTENSIONS),
+        ):
+            # Legacy ID -> current ID for every source file
+            id_map = {}
+            for root, _, files in os.walk(source_dir):
+                for filename in files:
+                    if os.path.splitext(filename)[1].lower() in extensions:
+                        rel_path_str = str((Path(root) / filename).relative_to(source_dir))
+                        id_map[self.get_legacy_file_id(rel_path_str)] = self.get_file_id(rel_path_str)
+
+            for thumbnail_file in (self.thumbnails_dir / kind).rglob("*"):
+                new_id = id_map.get(thumbnail_file.stem)
+                if new_id is None or not thumbnail_file.is_file():
+                    continue
+                target = thumbnail_file.with_name(f"{new_id}{thumbnail_file.suffix}")
+                if target.exists():
+                    print(f"  Skipping {thumbnail_file}: {target.name} already exists")
+                    continue
+                thumbnail_file.rename(target)
+                print(f"  Renamed {thumbnail_file.relative_to(self.thumbnails_dir)} -> {target.name}")
+                renamed += 1
+
+        return renamed
+
+    def load_model(self, model_path: Path) -> mujoco.MjModel:
+        """Load and compile a model XML, reusing an already compiled model
+
+        Args:
+            model_path: Absolute path to the model XML
+        """
+        import mujoco
+
+        key = str(model_path)
+        model = self._models.get(key)
+        if model is None:
+            model = mujoco.MjModel.from_xml_path(key)
+            self._models[key] = model
+        return model
+
+    def get_renderer(self, model: mujoco.MjModel) -> mujoco.Renderer:
+        """Return this generator's offscreen renderer for a model, creating it once
+
+        The GL context and framebuffer live until close(), so repeated
+        renders of the same model skip the context setup/teardown.
+
+        Args:
+            model: MuJoCo model
+        """
+        import mujoco
+
+        key = (id(model), THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0])
+        entry = self._renderers.get(key)
+        if entry is None:
+            # Keep the model referenced so its id() can't be reused
+            entry = (model, mujoco.Renderer(model, THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0]))
+            self._renderers[key] = entry
+        return entry[1]
+
+    def open_render_context(self, model_path: Path) -> Tuple[mujoco.MjModel, mujoco.MjData, mujoco.Renderer]:
+        """Build a (model, data, renderer) tuple that can be reused across trajectories
+
+        The renderer belongs to the generator and is released by close().
+
+        Args:
+            model_path: Absolute path to the model XML
+        """
+        import mujoco
+
+        model = self.load_model(model_path)
+        data = mujoco.MjData(model)
+        return model, data, self.get_renderer(model)
+
+    def close(self):
+        """Wait for pending encodes and release renderers and the encode thread"""
+        self.finish_encoding()
+        if self._encoder is not None:
+            self._encoder.shutdown()
+            self._encoder = None
+        for _, renderer in self._renderers.values():
+            renderer.close()
+        self._renderers.clear()
+
+    def _start_phases(self):
+        """Start collecting phase timings for one render if profiling"""
+        if self.profile:
+            self._phase_ns = {"load": 0, "pose": 0, "render": 0, "encode": 0}
+
+    def _add_phase(self, phase: str, start_ns: int) -> int:
+        """Charge the time since start_ns to a phase; returns the current time"""
+        now = time.perf_counter_ns()
+        if self._phase_ns is not None:
+            self._phase_ns[phase] += now - start_ns
+        return now
+
+    def _report_phases(self):
+        """Print and reset the phase timings collected by _start_phases()"""
+        if self._phase_ns is None:
+            return
+        print("  Phases: " + ", ".join(f"{phase} {ns / 1e6:.1f} ms" for phase, ns in self._phase_ns.items()))
+        self._phase_ns = None
+
+    def render_params(
+        self,
+        model_relative_path: str,
+        camera_name: str = None,
+        distance: float = None,
+        azimuth: float = None,
+        elevation: float = None,
+        lookat: list = None
+    ) -> dict:
+        """Settings that affect a thumbnail's pixels, recorded next to it
+
+        The model is identified by path and version (mtime_ns-size), so
+        re-pointing a trajectory at a different model re-renders it even if
+        that model's file is older than the thumbnail.
+        """
+        try:
+            stat = (self.models_dir / model_relative_path).stat()
+            model_version = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        except OSError:
+            model_version = None
+        return {
+            "model": model_relative_path,
+            "model_version": model_version,
+            "camera": camera_name,
+            "distance": distance,
+            "azimuth": azimuth,
+            "elevation": elevation,
+            "lookat": list(lookat) if lookat is not None else None,
+            "size": list(THUMBNAIL_SIZE),
+            "frames": TRAJECTORY_FRAMES,
+            "duration": ANIMATION_DURATION,
+            "quality": self.webp_quality,
+            "method": self.webp_method,
+        }
+
+    def is_up_to_date(self, output_path: Path, input_paths: list, params: dict) -> bool:
+        """Check whether a thumbnail can be kept as is
+
+        True if it is newer than every input file and was rendered with the
+        same settings (stored in a .json sidecar). Always False with force.
+
+        Args:
+            output_path: Thumbnail path
+            input_paths: Source files the thumbnail was rendered from
+            params: Current render_params()
+        """
+        if self.force:
+            return False
+        try:
+            output_mtime = output_path.stat().st_mtime_ns
+            if any(path.stat().st_mtime_ns > output_mtime for path in input_paths):
+                return False
+            with open(output_path.with_suffix(".json")) as f:
+                return json.load(f) == params
+        except (OSError, ValueError):
+            return False
+
+    def write_render_params(self, output_path: Path, params: dict):
+        """Record the settings a thumbnail was rendered with"""
+        with open(output_path.with_suffix(".json"), "w") as f:
+            json.dump(params, f)
+
+    def model_thumbnail_path(self, model_relative_path: str) -> Path:
+        """Thumbnail path for a model, mirroring the model directory structure
+
+        e.g., data/thumbnails/models/MS-Human-700/abc123.webp
+        """
+        model_id = self.get_file_id(model_relative_path)
+        return self.thumbnails_dir / "models" / Path(model_relative_path).parent / f"{model_id}.webp"
+
+    def trajectory_thumbnail_path(self, trajectory_path: Path) -> Path:
+        """Thumbnail path for a trajectory, mirroring the trajectory directory structure
+
+        e.g., data/thumbnails/trajectories/locomotion/xyz789.webp
+        """
+        rel_path = trajectory_path.relative_to(self.trajectories_dir)
+        trajectory_id = self.get_file_id(str(rel_path))
+        return self.thumbnails_dir / "trajectories" / rel_path.parent / f"{trajectory_id}.webp"
+
+    def resolve_camera(
         self,
         model: mujoco.MjModel,
-        data: mujoco.MjData,
         camera_name: str = None,
         distance: float = None,
         azimuth: float = None,
         elevation: float = None,
         lookat: list = None
-    ) -> np.ndarray:
-        """Render a frame with the specified camera configuration
+    ):
+        """Resolve the camera configuration to something Renderer.update_scene accepts
 
         Args:
             model: MuJoCo model
-            data: MuJoCo data
             camera_name: Name of camera defined in XML (if None, uses custom parameters)
             distance: Camera distance (used if camera_name is None)
             azimuth: Camera azimuth angle (used if camera_name is None)
             elevation: Camera elevation angle (used if camera_name is None)
             lookat: Camera lookat point (used if camera_name is None)
+
+        Returns:
+            XML camera id, or a configured MjvCamera
         """
-        # Create offscreen renderer
-        renderer = mujoco.Renderer(model, THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0])
+        # The camera only depends on the model and these parameters, so one
+        # resolved camera is shared by every trajectory rendered with them
+        key = (id(model), camera_name, distance, azimuth, elevation, tuple(lookat) if lookat is not None else None)
+        entry = self._cameras.get(key)
+        if entry is None:
+            # Keep the model referenced so its id() can't be reused
+            entry = (model, self._build_camera(model, camera_name, distance, azimuth, elevation, lookat))
+            self._cameras[key] = entry
+        return entry[1]
+
+    def _build_camera(
+        self,
+        model: mujoco.MjModel,
+        camera_name: str = None,
+        distance: float = None,
+        azimuth: float = None,
+        elevation: float = None,
+        lookat: list = None
+    ):
+        """Build the camera for resolve_camera()"""
+        import mujoco
 
         if camera_name:
             # Use camera defined in XML
             try:
                 camera_id = model.camera(camera_name).id
                 print(f"  Using XML camera: {camera_name} (id={camera_id})")
-                renderer.update_scene(data, camera=camera_id)
+                return camera_id
             except KeyError:
                 print(f"  Warning: Camera '{camera_name}' not found in model, using custom parameters")
-                # Fall back to custom parameters
-                camera_name = None
 
-        if not camera_name:
-            # Set up camera programmatically with custom parameters
-            camera = mujoco.MjvCamera()
-            mujoco.mjv_defaultFreeCamera(model, camera)
+        # Set up camera programmatically with custom parameters
+        camera = mujoco.MjvCamera()
+        mujoco.mjv_defaultFreeCamera(model, camera)
 
-            # Use provided parameters or defaults
-            camera.distance = distance if distance is not None else DEFAULT_CAMERA_DISTANCE
-            camera.azimuth = azimuth if azimuth is not None else DEFAULT_CAMERA_AZIMUTH
-            camera.elevation = elevation if elevation is not None else DEFAULT_CAMERA_ELEVATION
-            camera.lookat[:] = lookat if lookat is not None else DEFAULT_CAMERA_LOOKAT
+        # Use provided parameters or defaults
+        camera.distance = distance if distance is not None else DEFAULT_CAMERA_DISTANCE
+        camera.azimuth = azimuth if azimuth is not None else DEFAULT_CAMERA_AZIMUTH
+        camera.elevation = elevation if elevation is not None else DEFAULT_CAMERA_ELEVATION
+        camera.lookat[:] = lookat if lookat is not None else DEFAULT_CAMERA_LOOKAT
 
-            print(f"  Using custom camera: distance={camera.distance}, azimuth={camera.azimuth}, elevation={camera.elevation}")
+        print(f"  Using custom camera: distance={camera.distance}, azimuth={camera.azimuth}, elevation={camera.elevation}")
+        return camera
 
-            # Update scene with custom camera
-            renderer.update_scene(data, camera=camera)
+    def render_with_camera(
+        self,
+        model: mujoco.MjModel,
+        data: mujoco.MjData,
+        camera_name: str = None,
+        distance: float = None,
+        azimuth: float = None,
+        elevation: float = None,
+        lookat: list = None
+    ) -> np.ndarray:
+        """Render a frame with the specified camera configuration
 
-        # Render
-        pixels = renderer.render()
+        Args:
+            model: MuJoCo model
+            data: MuJoCo data
+            camera_name: Name of camera defined in XML (if None, uses custom parameters)
+            distance: Camera distance (used if camera_name is None)
+            azimuth: Camera azimuth angle (used if camera_name is None)
+            elevation: Camera elevation angle (used if camera_name is None)
+            lookat: Camera lookat point (used if camera_name is None)
+        """
+        camera = self.resolve_camera(model, camera_name, distance, azimuth, elevation, lookat)
 
-        # Clean up
-        renderer.close()
+        renderer = self.get_renderer(model)
+        renderer.update_scene(data, camera=camera)
+        return renderer.render()
 
-        return pixels
+    def render_frames(
+        self,
+        model: mujoco.MjModel,
+        data: mujoco.MjData,
+        qpos_frames: np.ndarray,
+        camera_name: str = None,
+        distance: float = None,
+        azimuth: float = None,
+        elevation: float = None,
+        lookat: list = None,
+        renderer: mujoco.Renderer = None
+    ) -> np.ndarray:
+        """Render a batch of poses in a single pass
+
+        One renderer (GL context, scene and framebuffer) and one camera are
+        set up for the whole batch, so each pose only costs a forward pass
+        and a draw instead of a full renderer setup/teardown.
+
+        Args:
+            model: MuJoCo model
+            data: MuJoCo data (its qpos is overwritten)
+            qpos_frames: Array of shape (num_frames, nq)
+            camera_name: Name of camera defined in XML (if None, uses custom parameters)
+            distance: Camera distance (used if camera_name is None)
+            azimuth: Camera azimuth angle (used if camera_name is None)
+            elevation: Camera elevation angle (used if camera_name is None)
+            lookat: Camera lookat point (used if camera_name is None)
+            renderer: Renderer for this model to draw with; the generator's
+                      renderer for the model is used if None
+
+        Returns:
+            Array of shape (num_frames, height, width, 3)
+        """
+        import numpy as np
+
+        camera = self.resolve_camera(model, camera_name, distance, azimuth, elevation, lookat)
+
+        if renderer is None:
+            renderer = self.get_renderer(model)
+
+        # Render straight into one contiguous buffer instead of stacking copies
+        frames = np.empty((len(qpos_frames), THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0], 3), dtype=np.uint8)
+        for i, qpos in enumerate(qpos_frames):
+            start = time.perf_counter_ns()
+            data.qpos[:] = qpos
+            pose_for_render(model, data)
+            start = self._add_phase("pose", start)
+            renderer.update_scene(data, camera=camera)
+            renderer.render(out=frames[i])
+            self._add_phase("render", start)
+        return frames
 
     def render_model(
         self,
@@ -144,6 +507,8 @@ class ThumbnailGenerator:
         Returns:
             True if successful, False otherwise
         """
+        import mujoco
+        from PIL import Image
 
         model_path = self.models_dir / model_relative_path
 
@@ -151,7 +516,7 @@ class ThumbnailGenerator:
             print(f"Error: Model not found at {model_path}")
             return False
 
-        if not model_path.suffix == '.xml':
+        if model_path.suffix.lower() not in MODEL_EXTENSIONS:
             print(f"Error: File is not an XML file: {model_path}")
             return False
 
@@ -162,30 +527,49 @@ class ThumbnailGenerator:
             model_id = self.get_file_id(rel_path_str)
 
             # Create thumbnail path mirroring the model directory structure
-            # e.g., data/thumbnails/models/MS-Human-700/abc123.webp
-            rel_path = Path(model_relative_path)
-            thumbnail_subdir = self.thumbnails_dir / "models" / rel_path.parent
-            thumbnail_subdir.mkdir(parents=True, exist_ok=True)
-            output_path = thumbnail_subdir / f"{model_id}.webp"
+            output_path = self.model_thumbnail_path(rel_path_str)
+
+            params = self.render_params(model_relative_path, camera_name, distance, azimuth, elevation, lookat)
+            if self.is_up_to_date(output_path, [model_path], params):
+                print(f"Skipped model (up-to-date): {rel_path_str}")
+                return True
+
+            output_path.parent.mkdir(parents=True, exist_ok=True)
 
             print(f"Rendering model: {rel_path_str}")
             print(f"  Model ID: {model_id}")
 
+            self._start_phases()
+            start = time.perf_counter_ns()
+
             # Load model
-            model = mujoco.MjModel.from_xml_path(str(model_path))
+            model = self.load_model(model_path)
             data = mujoco.MjData(model)
+            start = self._add_phase("load", start)
 
             # Reset to initial state
             mujoco.mj_forward(model, data)
+            start = self._add_phase("pose", start)
 
             # Render frame with camera
             pixels = self.render_with_camera(model, data, camera_name, distance, azimuth, elevation, lookat)
+            start = self._add_phase("render", start)
 
             # Save as WebP with compression
             img = Image.fromarray(pixels)
-            img.save(output_path, "WEBP", quality=85, method=6)
+            save_image(
+                img,
+                output_path,
+                "WEBP",
+                lossless=False,
+                quality=self.webp_quality,
+                method=self.webp_method
+            )
+            self.write_render_params(output_path, params)
+            self._add_phase("encode", start)
 
             print(f"Saved to {output_path}")
+            self._report_phases()
             return True
 
         except Exception as e:
@@ -200,7 +584,9 @@ class ThumbnailGenerator:
         distance: float = None,
         azimuth: float = None,
         elevation: float = None,
-        lookat: list = None
+        lookat: list = None,
+        context: Tuple[mujoco.MjModel, mujoco.MjData, mujoco.Renderer] = None,
+        background_encode: bool = False
     ) -> bool:
         """Render animated WebP for a single trajectory
 
@@ -212,10 +598,16 @@ class ThumbnailGenerator:
             azimuth: Horizontal rotation angle in degrees (used if camera_name not provided)
             elevation: Vertical rotation angle in degrees (used if camera_name not provided)
             lookat: Point to look at [x, y, z] (used if camera_name not provided)
+            context: (model, data, renderer) from open_render_context() to reuse
+                     instead of building them for this trajectory
+            background_encode: Hand the frames to the background encoder and return
+                               once rendered; call finish_encoding() for the outcome
 
         Returns:
             True if successful, False otherwise
         """
+        import mujoco
+        import numpy as np
 
         model_path = self.models_dir / model_relative_path
 
@@ -223,7 +615,7 @@ class ThumbnailGenerator:
             print(f"Error: Model not found at {model_path}")
             return False
 
-        if not model_path.suffix == '.xml':
+        if model_path.suffix.lower() not in MODEL_EXTENSIONS:
             print(f"Error: Model file is not an XML file: {model_path}")
             return False
 
@@ -235,66 +627,144 @@ class ThumbnailGenerator:
             trajectory_id = self.get_file_id(rel_path_str)
 
             # Create thumbnail path mirroring the trajectory directory structure
-            # e.g., data/thumbnails/trajectories/locomotion/xyz789.webp
-            thumbnail_subdir = self.thumbnails_dir / "trajectories" / rel_path.parent
-            thumbnail_subdir.mkdir(parents=True, exist_ok=True)
-            output_path = thumbnail_subdir / f"{trajectory_id}.webp"
+            output_path = self.trajectory_thumbnail_path(trajectory_path)
+
+            params = self.render_params(model_relative_path, camera_name, distance, azimuth, elevation, lookat)
+            if self.is_up_to_date(output_path, [model_path, trajectory_path], params):
+                print(f"Skipped trajectory (up-to-date): {rel_path_str}")
+                return True
+
+            output_path.parent.mkdir(parents=True, exist_ok=True)
 
             print(f"Rendering trajectory: {rel_path_str}")
             print(f"  Trajectory ID: {trajectory_id}")
             print(f"  Using model: {model_relative_path}")
 
-            # Load model
-            model = mujoco.MjModel.from_xml_path(str(model_path))
-            data = mujoco.MjData(model)
+            self._start_phases()
+            start = time.perf_counter_ns()
 
-            # Load trajectory data
-            trajectory_data = np.load(trajectory_path)
+            # Load model (or reuse the caller's warm model/data/renderer)
+            if context is not None:
+                model, data, renderer = context
+            else:
+                model = self.load_model(model_path)
+                data = mujoco.MjData(model)
+                renderer = None
+
+            # Load trajectory data. NPY files are memory-mapped so only the
+            # sampled rows are read from disk; NPZ members can't be mapped
+            # (they may be compressed) and are read on access
+            trajectory_data = np.load(trajectory_path, mmap_mode='r')
             if isinstance(trajectory_data, np.lib.npyio.NpzFile):
                 # NPZ file - get qpos array
-                qpos_data = trajectory_data['qpos_traj']
+                with trajectory_data:
+                    qpos_data = trajectory_data['qpos_traj']
             else:
                 # NPY file
                 qpos_data = trajectory_data
 
             total_frames = len(qpos_data)
 
-            # Sample frames evenly across trajectory
+            # Sample frames evenly across trajectory; np.take gathers just these
+            # rows out of the mapping into one C-contiguous float64 slab, so
+            # each per-frame data.qpos assignment is a straight copy
             frame_indices = np.linspace(0, total_frames - 1, TRAJECTORY_FRAMES, dtype=int)
+            qpos_frames = np.ascontiguousarray(np.take(qpos_data, frame_indices, axis=0), dtype=np.float64)
+            del trajectory_data, qpos_data
+            self._add_phase("load", start)
+
+            # Render all sampled frames in one pass
+            frames = self.render_frames(
+                model, data, qpos_frames,
+                camera_name, distance, azimuth, elevation, lookat,
+                renderer=renderer
+            )
+
+            # Encode inline while profiling so its time can be attributed
+            if background_encode and not self.profile:
+                self._submit_encode(output_path, frames, params)
+                return True
+            start = time.perf_counter_ns()
+            success = self.encode_animation(output_path, frames, params)
+            self._add_phase("encode", start)
+            self._report_phases()
+            return success
 
-            # Render frames
-            frames = []
-            for idx in frame_indices:
-                # Set qpos from trajectory
-                data.qpos[:] = qpos_data[idx]
-                mujoco.mj_forward(model, data)
+        except Exception as e:
+            print(f"Error: {e}")
+            return False
 
-                # Render frame with camera
-                pixels = self.render_with_camera(model, data, camera_name, distance, azimuth, elevation, lookat)
-                frames.append(pixels)
+    def encode_animation(self, output_path: Path, frames: np.ndarray, params: dict) -> bool:
+        """Encode rendered frames as an animated WebP
 
-            # Save as WebP animation with compression
-            pil_frames = [Image.fromarray(frame) for frame in frames]
+        Args:
+            output_path: Thumbnail path
+            frames: Array of shape (num_frames, height, width, 3)
+            params: render_params() recorded next to the thumbnail
+
+        Returns:
+            True if successful, False otherwise
+        """
+        from PIL import Image
+
+        try:
+            # Save as WebP animation with compression. The frames are wrapped
+            # as views over the contiguous buffer rather than copied
+            height, width = frames.shape[1:3]
+            pil_frames = [
+                Image.frombuffer("RGB", (width, height), frame, "raw", "RGB", 0, 1)
+                for frame in frames
+            ]
 
             # Save as animated WebP
-            pil_frames[0].save(
+            save_image(
+                pil_frames[0],
                 output_path,
                 "WEBP",
                 save_all=True,
                 append_images=pil_frames[1:],
                 duration=ANIMATION_DURATION,
                 loop=0,  # Infinite loop
-                quality=85,
-                method=6
+                lossless=False,
+                quality=self.webp_quality,
+                method=self.webp_method,
+                kmin=0,  # Only the first frame is a keyframe; skips the
+                kmax=0   # keyframe candidate search on every frame
             )
+            self.write_render_params(output_path, params)
 
             print(f"Saved to {output_path}")
             return True
 
         except Exception as e:
-            print(f"Error: {e}")
+            print(f"Error encoding {output_path}: {e}")
             return False
 
+    def _submit_encode(self, output_path: Path, frames: np.ndarray, params: dict):
+        """Queue an animation for the background encoder
+
+        libwebp runs without the GIL, so the next trajectory renders while
+        this one encodes. Blocks once ENCODE_QUEUE_DEPTH encodes are pending.
+        """
+        if self._encoder is None:
+            self._encoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webp-encode")
+        while len(self._pending_encodes) >= ENCODE_QUEUE_DEPTH:
+            if not self._pending_encodes.popleft().result():
+                self._encode_failures += 1
+        self._pending_encodes.append(self._encoder.submit(self.encode_animation, output_path, frames, params))
+
+    def finish_encoding(self) -> int:
+        """Wait for all queued background encodes
+
+        Returns:
+            Number of encodes that failed since the last call
+        """
+        while self._pending_encodes:
+            if not self._pending_encodes.popleft().result():
+                self._encode_failures += 1
+        failures, self._encode_failures = self._encode_failures, 0
+        return failures
+
     def render_trajectories_in_folder(
         self,
         folder_relative_path: str,
@@ -303,7 +773,8 @@ class ThumbnailGenerator:
         distance: float = None,
         azimuth: float = None,
         elevation: float = None,
-        lookat: list = None
+        lookat: list = None,
+        jobs: int = DEFAULT_JOBS
     ) -> Tuple[int, int]:
         """Render all trajectories in a folder
 
@@ -315,6 +786,7 @@ class ThumbnailGenerator:
             azimuth: Horizontal rotation angle in degrees (used if camera_name not provided)
             elevation: Vertical rotation angle in degrees (used if camera_name not provided)
             lookat: Point to look at [x, y, z] (used if camera_name not provided)
+            jobs: Number of worker processes (1 renders serially in this process)
 
         Returns:
             Tuple of (success_count, total_count)
@@ -330,7 +802,12 @@ class ThumbnailGenerator:
             return (0, 0)
 
         # Find all trajectory files in the folder
-        trajectory_files = list(folder_path.glob("*.npy")) + list(folder_path.glob("*.npz"))
+        # One directory read, filtered by suffix
+        with os.scandir(folder_path) as entries:
+            trajectory_files = sorted(
+                Path(entry.path) for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in TRAJECTORY_EXTENSIONS and entry.is_file()
+            )
 
         if not trajectory_files:
             print(f"Warning: No trajectory files (.npy/.npz) found in {folder_path}")
@@ -339,17 +816,83 @@ class ThumbnailGenerator:
         print(f"Found {len(trajectory_files)} trajectory file(s) in {folder_relative_path}")
         print()
 
-        success_count = 0
         total_count = len(trajectory_files)
 
-        for trajectory_file in trajectory_files:
-            if self.render_trajectory(trajectory_file, model_relative_path, camera_name, distance, azimuth, elevation, lookat):
-                success_count += 1
-            print()  # Blank line between trajectories
+        # Drop up-to-date trajectories before compiling the model or starting workers
+        model_path = self.models_dir / model_relative_path
+        params = self.render_params(model_relative_path, camera_name, distance, azimuth, elevation, lookat)
+        stale_files = [
+            trajectory_file for trajectory_file in trajectory_files
+            if not self.is_up_to_date(self.trajectory_thumbnail_path(trajectory_file), [model_path, trajectory_file], params)
+        ]
+        success_count = total_count - len(stale_files)
+        if success_count:
+            print(f"Skipped {success_count} up-to-date trajectory thumbnail(s)")
+            print()
+        trajectory_files = stale_files
+        if not trajectory_files:
+            return (success_count, total_count)
+
+        jobs = max(1, min(jobs, len(trajectory_files)))
+
+        if jobs == 1:
+            # Compile the model and open the GL context once for the whole folder
+            try:
+                context = self.open_render_context(model_path)
+            except Exception:
+                context = None  # render_trajectory reports the error per file
+            try:
+                # Encoding of each trajectory overlaps with rendering the next
+                for trajectory_file in trajectory_files:
+                    if self.render_trajectory(trajectory_file, model_relative_path, camera_name, distance, azimuth, elevation, lookat, context, background_encode=True):
+                        success_count += 1
+                    print()  # Blank line between trajectories
+            finally:
+                success_count -= self.finish_encoding()
+            return (success_count, total_count)
+
+        print(f"Rendering with {jobs} worker processes")
+        print()
+
+        # spawn rather than fork: GL contexts don't survive a fork
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.data_dir, self.webp_quality, self.webp_method, self.force, model_path)
+        ) as executor:
+            results = executor.map(
+                _render_trajectory_worker,
+                trajectory_files,
+                [(model_relative_path, camera_name, distance, azimuth, elevation, lookat)] * len(trajectory_files)
+            )
+            success_count += sum(1 for ok in results if ok)
 
         return (success_count, total_count)
 
 
+# Per-process generator and (model, data, renderer) used by the folder worker pool
+_worker_generator = None
+_worker_context = None
+
+
+def _init_worker(data_dir: Path, webp_quality: int, webp_method: int, force: bool, model_path: Path):
+    """Process pool initializer: build the generator and render context once per worker"""
+    global _worker_generator, _worker_context
+    _worker_generator = ThumbnailGenerator(data_dir, webp_quality=webp_quality, webp_method=webp_method, force=force)
+    atexit.register(_worker_generator.close)
+    try:
+        _worker_context = _worker_generator.open_render_context(model_path)
+    except Exception:
+        # render_trajectory reports the error per file
+        pass
+
+
+def _render_trajectory_worker(trajectory_path: Path, render_args: tuple) -> bool:
+    """Render one trajectory in a pool worker"""
+    return _worker_generator.render_trajectory(trajectory_path, *render_args, _worker_context)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate thumbnails for motion library (models and trajectories)",
@@ -357,6 +900,34 @@ def main():
     )
 
     parser.add_argument("--data-dir", default="./data", help="Data directory path (default: ../data)")
+    parser.add_argument(
+        "--quality",
+        type=int,
+        default=WEBP_QUALITY,
+        help=f"WebP quality factor 0-100 (default: {WEBP_QUALITY})"
+    )
+    parser.add_argument(
+        "--method",
+        type=int,
+        choices=range(7),
+        default=WEBP_METHOD,
+        metavar="0-6",
+        help=f"WebP encoder effort, 0 = fastest, 6 = smallest output (default: {WEBP_METHOD})"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="generate_thumbnails.prof",
+        default=None,
+        metavar="FILE",
+        help="Print load/pose/render/encode timings per thumbnail and write cProfile stats to FILE "
+             "(default: generate_thumbnails.prof); folders are rendered serially"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render thumbnails even if they are newer than their inputs and were rendered with the same settings"
+    )
 
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
@@ -480,6 +1051,18 @@ Examples:
         default=None,
         help=f"Camera lookat point [x y z] (default: {DEFAULT_CAMERA_LOOKAT}, ignored if --camera specified)"
     )
+    trajectory_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Worker processes when rendering a folder (default: {DEFAULT_JOBS}, 1 = serial)"
+    )
+
+    # migrate-ids subcommand
+    subparsers.add_parser(
+        "migrate-ids",
+        help="Rename thumbnails generated with legacy MD5 IDs to the current BLAKE2b IDs"
+    )
 
     args = parser.parse_args()
 
@@ -496,31 +1079,31 @@ Examples:
         print(f"Make sure you're running from the backend/ directory")
         return
 
-    generator = ThumbnailGenerator(data_dir)
-
-    if args.command == "render-model":
-        # Render a single model
-        success = generator.render_model(
-            args.model,
-            camera_name=args.camera,
-            distance=args.distance,
-            azimuth=args.azimuth,
-            elevation=args.elevation,
-            lookat=args.lookat
-        )
-        if success:
-            print("\nModel thumbnail generated successfully")
-        else:
-            print("\nFailed to generate model thumbnail")
-
-    elif args.command == "render-trajectory":
-        # Check if trajectory path is a file or folder
-        trajectory_path = generator.trajectories_dir / args.trajectory
-
-        if trajectory_path.is_file():
-            # Render single trajectory file
-            success = generator.render_trajectory(
-                trajectory_path,
+    generator = ThumbnailGenerator(
+        data_dir,
+        webp_quality=args.quality,
+        webp_method=args.method,
+        force=args.force,
+        profile=args.profile is not None
+    )
+
+    profiler = None
+    if args.profile is not None:
+        # Worker processes aren't profiled, so keep everything in this one
+        if getattr(args, "jobs", 1) != 1:
+            print("Profiling: rendering folders serially (--jobs 1)")
+            args.jobs = 1
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        if args.command == "migrate-ids":
+            renamed = generator.migrate_thumbnail_ids()
+            print(f"\nMigrated {renamed} thumbnail(s) to current IDs")
+
+        elif args.command == "render-model":
+            # Render a single model
+            success = generator.render_model(
                 args.model,
                 camera_name=args.camera,
                 distance=args.distance,
@@ -529,26 +1112,54 @@ Examples:
                 lookat=args.lookat
             )
             if success:
-                print("\nTrajectory animation generated successfully")
+                print("\nModel thumbnail generated successfully")
             else:
-                print("\nFailed to generate trajectory animation")
+                print("\nFailed to generate model thumbnail")
+
+        elif args.command == "render-trajectory":
+            # Check if trajectory path is a file or folder
+            trajectory_path = generator.trajectories_dir / args.trajectory
+
+            if trajectory_path.is_file():
+                # Render single trajectory file
+                success = generator.render_trajectory(
+                    trajectory_path,
+                    args.model,
+                    camera_name=args.camera,
+                    distance=args.distance,
+                    azimuth=args.azimuth,
+                    elevation=args.elevation,
+                    lookat=args.lookat
+                )
+                if success:
+                    print("\nTrajectory animation generated successfully")
+                else:
+                    print("\nFailed to generate trajectory animation")
+
+            elif trajectory_path.is_dir():
+                # Render all trajectories in folder
+                success_count, total_count = generator.render_trajectories_in_folder(
+                    args.trajectory,
+                    args.model,
+                    camera_name=args.camera,
+                    distance=args.distance,
+                    azimuth=args.azimuth,
+                    elevation=args.elevation,
+                    lookat=args.lookat,
+                    jobs=args.jobs
+                )
+                print(f"\nCompleted: {success_count}/{total_count} trajectory animations generated successfully")
 
-        elif trajectory_path.is_dir():
-            # Render all trajectories in folder
-            success_count, total_count = generator.render_trajectories_in_folder(
-                args.trajectory,
-                args.model,
-                camera_name=args.camera,
-                distance=args.distance,
-                azimuth=args.azimuth,
-                elevation=args.elevation,
-                lookat=args.lookat
-            )
-            print(f"\nCompleted: {success_count}/{total_count} trajectory animations generated successfully")
-
-        else:
-            print(f"Error: Trajectory path not found: {trajectory_path}")
-            print("Path must be a .npy/.npz file or a folder containing trajectory files")
+            else:
+                print(f"Error: Trajectory path not found: {trajectory_path}")
+                print("Path must be a .npy/.npz file or a folder containing trajectory files")
+
+    finally:
+        generator.close()
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to {args.profile}")
 
 
 if __name__ == "__main__":
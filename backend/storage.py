@@ -1,20 +1,63 @@
 import os
+import shutil
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import orjson
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import BinaryIO, Iterator, List, Optional, Tuple
 import hashlib
+from cachetools import TTLCache
 from models import TrajectoryMetadata, ModelMetadata
 from config import settings
 
 
+# Accepted file extensions (compared against the lowercased suffix)
+TRAJECTORY_EXTENSIONS = frozenset({'.npy', '.npz'})
+MODEL_EXTENSIONS = frozenset({'.xml'})
+
+# Thumbnail extensions in order of preference when an item has several
+THUMBNAIL_EXTENSIONS = ('.webp', '.png', '.jpg', '.gif')
+
+# Chunk size used when copying uploads to disk
+COPY_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Parsed trajectory metadata persisted across restarts (under DATA_DIR, not
+# the trajectories tree, so writing it doesn't bump that tree's mtimes)
+TRAJECTORY_META_CACHE = ".meta_cache.json"
+
+# Header reads for uncached trajectories are latency-bound, so a scan that
+# finds at least PARALLEL_PARSE_MIN_FILES of them parses them concurrently
+PARALLEL_PARSE_MIN_FILES = 32
+PARSE_WORKERS = 16
+
+
+@lru_cache(maxsize=8192)
+def file_id(relative_path: str) -> str:
+    """Stable ID for a file, derived from its path relative to models/ or trajectories/."""
+    return hashlib.blake2b(relative_path.encode(), digest_size=8).hexdigest()
+
+
+class UnsafePathError(ValueError):
+    """An upload's filename or directory would resolve outside its storage root."""
+
+
+def file_version(stat: os.stat_result) -> str:
+    """Version string for a file's current contents (mtime_ns-size in hex)."""
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
 class StorageManager:
     """Manages file system storage for trajectories and models."""
 
     def __init__(self):
-        self.models_dir = settings.get_models_path()
-        self.trajectories_dir = settings.get_trajectories_path()
-        self.base_path = Path(settings.DATA_DIR).resolve()
+        self.models_dir = settings.models_path
+        self.trajectories_dir = settings.trajectories_path
+        self.base_path = settings.data_path
         self.thumbnails_dir = self.base_path / "thumbnails"
 
         # Ensure directories exist
@@ -23,259 +66,724 @@ class StorageManager:
         (self.thumbnails_dir / "models").mkdir(parents=True, exist_ok=True)
         (self.thumbnails_dir / "trajectories").mkdir(parents=True, exist_ok=True)
 
+        # Short-lived stat cache for files served over HTTP
+        self._stat_cache = TTLCache(maxsize=4096, ttl=5)
+        self._stat_lock = threading.Lock()
+
+        # Single-slot listing caches ("trajectories"/"models" -> (signature, items))
+        self._listing_cache = {}
+        self._listing_lock = threading.Lock()
+
+        # Lazily built ID -> path indexes ("trajectories"/"models" -> {id: path})
+        self._id_index = {}
+        self._id_index_lock = threading.Lock()
+
+        # rel_path -> {mtime_ns, size, frame_count, frame_rate, num_joints}
+        self._meta_cache_path = self.base_path / TRAJECTORY_META_CACHE
+        self._meta_cache = self._load_meta_cache()
+        self._meta_cache_dirty = False
+        self._meta_cache_lock = threading.Lock()
+
     def _get_file_id(self, filename: str) -> str:
         """Generate a unique ID for a file."""
-        return hashlib.md5(filename.encode()).hexdigest()[:16]
+        return file_id(filename)
+
+    def stat_file(self, file_path: Path) -> os.stat_result:
+        """Return os.stat for a file, cached for a few seconds."""
+        key = str(file_path)
+        with self._stat_lock:
+            stat = self._stat_cache.get(key)
+        if stat is None:
+            stat = os.stat(key)
+            with self._stat_lock:
+                self._stat_cache[key] = stat
+        return stat
+
+    def _forget_stat(self, file_path: Path) -> None:
+        """Drop a cached stat result after the file was written or removed."""
+        with self._stat_lock:
+            self._stat_cache.pop(str(file_path), None)
+
+    def _tree_signature(self, *roots: Path) -> Tuple[Tuple[str, int], ...]:
+        """Collect (directory, mtime_ns) for every directory under the given roots.
+
+        Adding, removing or renaming an entry bumps its parent directory's
+        mtime, so an unchanged signature means the listing is still valid.
+        Symlinked directories are skipped, matching _walk_files.
+        """
+        signature = []
+        for root in roots:
+            root = str(root)
+            try:
+                signature.append((root, os.stat(root).st_mtime_ns))
+            except OSError:
+                continue
+            # Subdirectory mtimes come from their DirEntry while scanning the parent
+            pending = deque([root])
+            while pending:
+                try:
+                    entries = list(os.scandir(pending.popleft()))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        signature.append((entry.path, entry.stat().st_mtime_ns))
+                        pending.append(entry.path)
+        return tuple(signature)
+
+    def _lookup_listing(self, kind: str, roots: Tuple[Path, ...]) -> Tuple[tuple, Optional[list]]:
+        """Return the current signature and the cached listing if it still matches."""
+        signature = self._tree_signature(*roots)
+        with self._listing_lock:
+            cached = self._listing_cache.get(kind)
+        if cached is not None and cached[0] == signature:
+            return signature, cached[1]
+        return signature, None
+
+    def _store_listing(self, kind: str, signature: tuple, items: list) -> None:
+        """Cache a freshly scanned listing under the signature taken before the scan."""
+        with self._listing_lock:
+            self._listing_cache[kind] = (signature, items)
+
+    def _cached_listing(self, kind: str, roots: Tuple[Path, ...], scan) -> list:
+        """Return the cached listing for `kind`, rescanning if any root changed."""
+        signature, items = self._lookup_listing(kind, roots)
+        if items is None:
+            items = scan()
+            self._store_listing(kind, signature, items)
+        return items
+
+    def _invalidate_listing(self, kind: str) -> None:
+        """Drop a cached listing after a write that may not change directory mtimes."""
+        with self._listing_lock:
+            self._listing_cache.pop(kind, None)
+
+    def _lookup_id(self, kind: str, item_id: str, build) -> Optional[Path]:
+        """Resolve an ID through the `kind` index, rebuilding it on a miss.
+
+        A miss or a stale hit (file removed outside the API) triggers one
+        rebuild, so files added or removed behind our back are still found.
+        """
+        with self._id_index_lock:
+            index = self._id_index.get(kind)
+        if index is not None:
+            file_path = index.get(item_id)
+            if file_path is not None and file_path.is_file():
+                return file_path
+
+        index = build()
+        with self._id_index_lock:
+            self._id_index[kind] = index
+        return index.get(item_id)
+
+    def _index_id(self, kind: str, item_id: str, file_path: Optional[Path]) -> None:
+        """Add (or with file_path=None, remove) a single entry of a built index."""
+        with self._id_index_lock:
+            index = self._id_index.get(kind)
+            if index is None:
+                return
+            if file_path is None:
+                index.pop(item_id, None)
+            else:
+                index[item_id] = file_path
 
-    def _parse_trajectory_file(self, file_path: Path) -> Tuple[Optional[int], Optional[float], Optional[int]]:
-        """Parse NPY/NPZ file to extract metadata."""
+    def _load_meta_cache(self) -> dict:
+        """Read the persisted trajectory metadata cache, or start empty."""
         try:
-            if file_path.suffix == '.npz':
-                data = np.load(file_path)
-                qpos = data.get('qpos_traj')
-                frame_rate = data.get('frame_rate', data.get('framerate'))
-
-                if qpos is not None:
-                    frame_count = qpos.shape[0] if len(qpos.shape) > 1 else len(qpos)
-                    num_joints = qpos.shape[1] if len(qpos.shape) > 1 else None
-                else:
-                    frame_count = None
-                    num_joints = None
-
-                if frame_rate is not None:
-                    frame_rate = float(frame_rate)
-
-                return frame_count, frame_rate, num_joints
-
-            elif file_path.suffix == '.npy':
-                data = np.load(file_path)
-                if len(data.shape) > 1:
-                    frame_count = data.shape[0]
-                    num_joints = data.shape[1]
-                else:
-                    frame_count = len(data)
-                    num_joints = None
-
-                return frame_count, None, num_joints
+            with open(self._meta_cache_path, 'rb') as f:
+                cache = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _save_meta_cache(self, keep: Optional[set] = None) -> None:
+        """Persist the trajectory metadata cache if it changed.
 
+        Args:
+            keep: If given, drop entries for files not in this set of
+                  relative paths (i.e. files deleted since they were cached)
+        """
+        with self._meta_cache_lock:
+            if keep is not None:
+                stale = self._meta_cache.keys() - keep
+                for rel_path in stale:
+                    del self._meta_cache[rel_path]
+                if stale:
+                    self._meta_cache_dirty = True
+            if not self._meta_cache_dirty:
+                return
+            payload = orjson.dumps(self._meta_cache)
+            self._meta_cache_dirty = False
+
+        # Write-then-rename so concurrent readers never see a partial file. The
+        # temp name is unique per thread as well as per process, so concurrent
+        # saves never write into each other's file
+        tmp_path = self._meta_cache_path.with_name(
+            f"{TRAJECTORY_META_CACHE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self._meta_cache_path)
+        except OSError as e:
+            print(f"Error writing trajectory metadata cache: {e}")
+
+    def _forget_meta(self, rel_path: str) -> None:
+        """Drop a deleted trajectory's cached metadata and persist the change."""
+        with self._meta_cache_lock:
+            if self._meta_cache.pop(rel_path, None) is None:
+                return
+            self._meta_cache_dirty = True
+        self._save_meta_cache()
+
+    def _parse_trajectory_file(
+        self,
+        file_path: Path,
+        stat: Optional[os.stat_result] = None,
+        rel_path: Optional[str] = None
+    ) -> Tuple[Optional[int], Optional[float], Optional[int]]:
+        """Parse NPY/NPZ file to extract metadata.
+
+        Results are cached by relative path and reused while the file's
+        (mtime_ns, size) is unchanged, so NumPy is only touched for new or
+        modified files. Callers that already have the stat result or the
+        path relative to trajectories/ can pass them in.
+        """
+        try:
+            if stat is None:
+                stat = os.stat(file_path)
+            if rel_path is None:
+                rel_path = str(file_path.relative_to(self.trajectories_dir))
+        except (OSError, ValueError) as e:
+            print(f"Error parsing trajectory file {file_path}: {e}")
+            return None, None, None
+
+        with self._meta_cache_lock:
+            entry = self._meta_cache.get(rel_path)
+        if entry is not None and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+            return entry['frame_count'], entry['frame_rate'], entry['num_joints']
+
+        try:
+            frame_count, frame_rate, num_joints = self._read_trajectory_metadata(file_path)
         except Exception as e:
             print(f"Error parsing trajectory file {file_path}: {e}")
+            return None, None, None
+
+        with self._meta_cache_lock:
+            self._meta_cache[rel_path] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'frame_count': frame_count,
+                'frame_rate': frame_rate,
+                'num_joints': num_joints,
+            }
+            self._meta_cache_dirty = True
+
+        return frame_count, frame_rate, num_joints
+
+    @staticmethod
+    def _read_npy_shape(fileobj: BinaryIO) -> Tuple[int, ...]:
+        """Read an array shape from an .npy header without touching the data."""
+        version = np.lib.format.read_magic(fileobj)
+        if version == (1, 0):
+            shape, _, _ = np.lib.format.read_array_header_1_0(fileobj)
+        elif version == (2, 0):
+            shape, _, _ = np.lib.format.read_array_header_2_0(fileobj)
+        else:
+            raise ValueError(f"unsupported .npy format version {version}")
+        return shape
+
+    def _read_trajectory_metadata(self, file_path: Path) -> Tuple[Optional[int], Optional[float], Optional[int]]:
+        """Read metadata from an NPY/NPZ file.
+
+        Only array shapes are needed, so array data is never read into memory.
+        """
+        suffix = file_path.suffix.lower()
+        if suffix == '.npz':
+            # Go through the zip central directory directly: take the qpos
+            # shape from its member's .npy header and only read the tiny
+            # frame_rate scalar member
+            with zipfile.ZipFile(file_path) as archive:
+                members = set(archive.namelist())
+
+                shape = None
+                if 'qpos_traj.npy' in members:
+                    with archive.open('qpos_traj.npy') as member:
+                        shape = self._read_npy_shape(member)
+
+                frame_rate = None
+                for key in ('frame_rate', 'framerate'):
+                    if f'{key}.npy' in members:
+                        with archive.open(f'{key}.npy') as member:
+                            frame_rate = float(np.lib.format.read_array(member, allow_pickle=False))
+                        break
+
+            if shape is not None:
+                frame_count = shape[0]
+                num_joints = shape[1] if len(shape) > 1 else None
+            else:
+                frame_count = None
+                num_joints = None
+
+            return frame_count, frame_rate, num_joints
+
+        elif suffix == '.npy':
+            # Only the header (first ~128 bytes) is read
+            try:
+                with open(file_path, 'rb') as f:
+                    shape = self._read_npy_shape(f)
+            except ValueError:
+                # Header the direct reader can't handle: let np.load parse it,
+                # memory-mapped so the data pages are never read
+                data = np.load(file_path, mmap_mode='r', allow_pickle=False)
+                try:
+                    shape = data.shape
+                finally:
+                    del data
+
+            frame_count = shape[0]
+            num_joints = shape[1] if len(shape) > 1 else None
+
+            return frame_count, None, num_joints
 
         return None, None, None
 
-    def _find_thumbnail(self, item_id: str, item_type: str) -> Optional[str]:
+    def _walk_files(self, root: Path, extensions) -> Iterator[Tuple[str, os.DirEntry]]:
+        """Breadth-first os.scandir walk yielding (relative dir, entry) per matching file.
+
+        Files match if their lowercased suffix is in `extensions`. The
+        relative dir is '' for files directly under `root`. Symlinked
+        directories are not descended into (as with Path.rglob), so a link
+        loop or a link out of the data directory can't be walked.
+        """
+        pending = deque([('', str(root))])
+        while pending:
+            rel_dir, dir_path = pending.popleft()
+            try:
+                entries = list(os.scandir(dir_path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((os.path.join(rel_dir, entry.name), entry.path))
+                elif os.path.splitext(entry.name)[1].lower() in extensions:
+                    yield rel_dir, entry
+
+    def _build_thumbnail_index(self, item_type: str) -> dict:
+        """Walk a thumbnail tree once and map item IDs to (path, version).
+
+        Thumbnails mirror the source directory structure, e.g.
+        thumbnails/models/MS-Human-700/{id}.webp; paths are relative to
+        base_path. If an ID has several thumbnails, the extension earliest
+        in THUMBNAIL_EXTENSIONS wins.
+        """
+        found = {}
+        for rel_dir, entry in self._walk_files(self.thumbnails_dir / item_type, THUMBNAIL_EXTENSIONS):
+            item_id, ext = os.path.splitext(entry.name)
+            if ext not in THUMBNAIL_EXTENSIONS:
+                continue  # Extensions are matched case-sensitively
+            rank = THUMBNAIL_EXTENSIONS.index(ext)
+            if item_id in found and found[item_id][0] <= rank:
+                continue
+            try:
+                version = file_version(entry.stat())
+            except OSError:
+                continue
+            rel_path = os.path.join("thumbnails", item_type, rel_dir, entry.name)
+            found[item_id] = (rank, rel_path, version)
+        return {item_id: (rel_path, version) for item_id, (_, rel_path, version) in found.items()}
+
+    def _scan_for_thumbnail(self, root: Path, stem: str) -> Optional[Tuple[str, os.DirEntry]]:
+        """Walk `root` once looking for a thumbnail named `stem` with any extension.
+
+        Returns (relative dir, entry) of the match whose extension comes
+        earliest in THUMBNAIL_EXTENSIONS, stopping at the first
+        top-ranked match, or None if there is no thumbnail.
+        """
+        best = None
+        best_rank = len(THUMBNAIL_EXTENSIONS)
+        for rel_dir, entry in self._walk_files(root, THUMBNAIL_EXTENSIONS):
+            name, ext = os.path.splitext(entry.name)
+            if name != stem or ext not in THUMBNAIL_EXTENSIONS:
+                continue
+            rank = THUMBNAIL_EXTENSIONS.index(ext)
+            if rank < best_rank:
+                best, best_rank = (rel_dir, entry), rank
+                if rank == 0:
+                    break
+        return best
+
+    def _find_thumbnail(self, item_id: str, item_type: str, index: Optional[dict] = None) -> Tuple[Optional[str], Optional[str]]:
         """Find thumbnail file for a model or trajectory by ID.
 
         Args:
             item_id: The ID of the model or trajectory
             item_type: Either "models" or "trajectories"
+            index: Result of _build_thumbnail_index(item_type) to look the ID
+                up in; if omitted the thumbnail tree is searched for this ID only
 
         Returns:
-            Relative path from base_path if thumbnail exists, None otherwise
+            Tuple of (relative path from base_path, version) if thumbnail
+            exists, (None, None) otherwise
         """
-        thumbnail_dir = self.thumbnails_dir / item_type
+        if index is not None:
+            return index.get(item_id, (None, None))
 
-        # Look for thumbnail files recursively (thumbnails mirror directory structure)
-        # e.g., thumbnails/models/MS-Human-700/{id}.webp
-        for ext in ['.webp', '.png', '.jpg', '.gif']:
-            # Search recursively for matching thumbnail
-            for thumbnail_file in thumbnail_dir.rglob(f"{item_id}{ext}"):
-                return str(thumbnail_file.relative_to(self.base_path))
-
-        return None
+        match = self._scan_for_thumbnail(self.thumbnails_dir / item_type, item_id)
+        if match is None:
+            return None, None
+        rel_dir, entry = match
+        try:
+            version = file_version(entry.stat())
+        except OSError:
+            return None, None
+        return os.path.join("thumbnails", item_type, rel_dir, entry.name), version
 
     def list_trajectories(self, category: Optional[str] = None) -> List[TrajectoryMetadata]:
         """List all trajectory files."""
-        trajectories = []
-
-        # Walk through trajectories directory
-        for root, dirs, files in os.walk(self.trajectories_dir):
-            rel_path = Path(root).relative_to(self.trajectories_dir)
-            current_category = str(rel_path) if str(rel_path) != '.' else None
-
-            # Filter by category if specified
-            if category and current_category != category:
-                continue
+        trajectories = self._cached_listing(
+            "trajectories",
+            self._trajectory_roots(),
+            self._scan_trajectories
+        )
 
-            for filename in files:
-                if filename.endswith(('.npy', '.npz')):
-                    file_path = Path(root) / filename
-                    stat = file_path.stat()
+        # Filter by category if specified
+        if category:
+            return [t for t in trajectories if t.category == category]
+        return list(trajectories)
 
-                    # Parse trajectory file
-                    frame_count, frame_rate, num_joints = self._parse_trajectory_file(file_path)
+    def iter_trajectories(self, category: Optional[str] = None) -> Iterator[TrajectoryMetadata]:
+        """Yield trajectory metadata without building the whole list first.
 
-                    # Get trajectory ID and check for thumbnail
-                    trajectory_id = self._get_file_id(str(file_path.relative_to(self.trajectories_dir)))
-                    thumbnail_path = self._find_thumbnail(trajectory_id, "trajectories")
+        The order is unspecified and depends on cache state: a valid cached
+        listing is replayed in its usual newest-first order, while on a cache
+        miss items are yielded in scan order as soon as each file is parsed
+        (sorting would mean waiting for the whole scan). The complete listing
+        is cached once the scan finishes.
+        """
+        signature, trajectories = self._lookup_listing("trajectories", self._trajectory_roots())
+
+        if trajectories is None:
+            trajectories = []
+            for trajectory in self._iter_scan_trajectories():
+                trajectories.append(trajectory)
+                if not category or trajectory.category == category:
+                    yield trajectory
+            trajectories.sort(key=lambda x: x.upload_date, reverse=True)
+            self._store_listing("trajectories", signature, trajectories)
+            return
+
+        for trajectory in trajectories:
+            if not category or trajectory.category == category:
+                yield trajectory
+
+    def _trajectory_roots(self) -> Tuple[Path, ...]:
+        """Directories whose changes invalidate the trajectory listing."""
+        return (self.trajectories_dir, self.thumbnails_dir / "trajectories")
+
+    def _scan_trajectories(self) -> List[TrajectoryMetadata]:
+        """Walk the trajectories directory and build metadata for every file."""
+        return sorted(self._iter_scan_trajectories(prefetch=True), key=lambda x: x.upload_date, reverse=True)
+
+    def _iter_trajectory_files(self) -> Iterator[Tuple[str, os.DirEntry]]:
+        """Yield (relative dir, entry) for every trajectory file."""
+        return self._walk_files(self.trajectories_dir, TRAJECTORY_EXTENSIONS)
+
+    def _is_meta_cached(self, rel_path: str, stat: os.stat_result) -> bool:
+        """Whether _parse_trajectory_file can answer from the metadata cache."""
+        with self._meta_cache_lock:
+            entry = self._meta_cache.get(rel_path)
+        return entry is not None and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size
+
+    def _prefetch_trajectory_metadata(self, files: List[Tuple[str, os.DirEntry, os.stat_result, str]]) -> None:
+        """Parse uncached trajectory files on a thread pool to fill the metadata cache."""
+        misses = [
+            (Path(entry.path), stat, rel_path)
+            for _, entry, stat, rel_path in files
+            if not self._is_meta_cached(rel_path, stat)
+        ]
+        if len(misses) < PARALLEL_PARSE_MIN_FILES:
+            return
+        with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+            for _ in executor.map(lambda args: self._parse_trajectory_file(*args), misses):
+                pass
+
+    def _iter_scan_trajectories(self, prefetch: bool = False) -> Iterator[TrajectoryMetadata]:
+        """Walk the trajectories directory, yielding metadata for each file.
 
-                    trajectories.append(TrajectoryMetadata(
-                        id=trajectory_id,
-                        filename=filename,
-                        category=current_category,
-                        file_size=stat.st_size,
-                        upload_date=datetime.fromtimestamp(stat.st_mtime),
-                        frame_count=frame_count,
-                        frame_rate=frame_rate,
-                        num_joints=num_joints,
-                        thumbnail_path=thumbnail_path
-                    ))
+        Args:
+            prefetch: Walk the whole tree first and parse uncached headers on
+                      a thread pool. Leave off when streaming, so each file is
+                      yielded as soon as the walk reaches it.
+        """
+        seen = set()
+        thumbnails = self._build_thumbnail_index("trajectories")
 
-        return sorted(trajectories, key=lambda x: x.upload_date, reverse=True)
+        files = (
+            (rel_dir, entry, entry.stat(), os.path.join(rel_dir, entry.name))
+            for rel_dir, entry in self._iter_trajectory_files()
+        )
+        if prefetch:
+            files = list(files)
+            self._prefetch_trajectory_metadata(files)
+
+        for rel_dir, entry, stat, rel_path_str in files:
+            seen.add(rel_path_str)
+
+            # Parse trajectory file (a cache hit if it was prefetched)
+            frame_count, frame_rate, num_joints = self._parse_trajectory_file(Path(entry.path), stat, rel_path_str)
+
+            # Get trajectory ID and check for thumbnail
+            trajectory_id = self._get_file_id(rel_path_str)
+            thumbnail_path, thumbnail_version = self._find_thumbnail(trajectory_id, "trajectories", thumbnails)
+
+            yield TrajectoryMetadata(
+                id=trajectory_id,
+                filename=entry.name,
+                category=rel_dir or None,
+                file_size=stat.st_size,
+                upload_date=datetime.fromtimestamp(stat.st_mtime),
+                frame_count=frame_count,
+                frame_rate=frame_rate,
+                num_joints=num_joints,
+                thumbnail_path=thumbnail_path,
+                thumbnail_version=thumbnail_version
+            )
+
+        self._save_meta_cache(keep=seen)
 
     def get_trajectory(self, trajectory_id: str) -> Optional[Path]:
         """Get trajectory file path by ID."""
-        for root, dirs, files in os.walk(self.trajectories_dir):
-            for filename in files:
-                if filename.endswith(('.npy', '.npz')):
-                    file_path = Path(root) / filename
-                    rel_path = file_path.relative_to(self.trajectories_dir)
-                    if self._get_file_id(str(rel_path)) == trajectory_id:
-                        return file_path
-        return None
-
-    def save_trajectory(self, filename: str, content: bytes, category: Optional[str] = None) -> TrajectoryMetadata:
-        """Save a trajectory file."""
-        # Determine save location
-        if category:
-            save_dir = self.trajectories_dir / category
-            save_dir.mkdir(parents=True, exist_ok=True)
-        else:
-            save_dir = self.trajectories_dir
+        return self._lookup_id("trajectories", trajectory_id, self._build_trajectory_index)
+
+    def _build_trajectory_index(self) -> dict:
+        """Walk the trajectories directory once and map every file ID to its path."""
+        return {
+            self._get_file_id(os.path.join(rel_dir, entry.name)): Path(entry.path)
+            for rel_dir, entry in self._iter_trajectory_files()
+        }
+
+    def _write_stream(self, file_path: Path, source: BinaryIO) -> None:
+        """Copy a file-like object to disk in fixed-size chunks.
+
+        The data goes to a temporary .part file that is then renamed over
+        file_path. Readers never see a half-written file, and replacing the
+        directory entry bumps the directory mtime that every worker's listing
+        cache watches (an in-place overwrite would not).
+        """
+        part_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.part")
+        try:
+            with open(part_path, 'wb') as dst:
+                shutil.copyfileobj(source, dst, COPY_CHUNK_SIZE)
+            os.replace(part_path, file_path)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _check_name(name: str, what: str) -> None:
+        """Reject a single path component that could name another directory."""
+        if not name or name in ('.', '..') or os.sep in name or (os.altsep and os.altsep in name):
+            raise UnsafePathError(f"Invalid {what}: {name!r}")
+
+    def _upload_destination(self, root: Path, subdir: Optional[str], filename: str) -> Path:
+        """Return root/subdir/filename, creating subdir, if it stays under root.
+
+        root is already resolved (settings paths), so only the target
+        directory needs resolving; the same commonpath check as
+        get_file_in_model_directory also catches symlinks out of root.
+        """
+        self._check_name(filename, "filename")
+        save_dir = root / subdir if subdir else root
+        root_str = str(root)
+        if os.path.commonpath((os.path.realpath(save_dir), root_str)) != root_str:
+            raise UnsafePathError(f"Invalid directory: {subdir!r}")
+        save_dir.mkdir(parents=True, exist_ok=True)
+        return save_dir / filename
+
+    def trajectory_path(self, filename: str, category: Optional[str] = None) -> Path:
+        """Return the destination path for a trajectory, creating its category directory.
+
+        Raises:
+            UnsafePathError: If the filename or category would leave trajectories_dir
+        """
+        return self._upload_destination(self.trajectories_dir, category, filename)
 
-        file_path = save_dir / filename
+    def save_trajectory(self, filename: str, source: BinaryIO, category: Optional[str] = None) -> TrajectoryMetadata:
+        """Save a trajectory file streamed from a file-like object."""
+        file_path = self.trajectory_path(filename, category)
 
         # Write file
-        file_path.write_bytes(content)
+        self._write_stream(file_path, source)
+
+        return self.register_trajectory(file_path, category)
+
+    def register_trajectory(self, file_path: Path, category: Optional[str] = None) -> TrajectoryMetadata:
+        """Refresh caches for a newly written trajectory file and return its metadata."""
+        self._forget_stat(file_path)
+        self._invalidate_listing("trajectories")
 
-        # Get metadata
-        stat = file_path.stat()
-        frame_count, frame_rate, num_joints = self._parse_trajectory_file(file_path)
+        # Get metadata (one stat and one relative path, shared with the parser)
+        stat = os.stat(file_path)
+        rel_path = str(file_path.relative_to(self.trajectories_dir))
+        frame_count, frame_rate, num_joints = self._parse_trajectory_file(file_path, stat, rel_path)
+        self._save_meta_cache()
 
         # Get trajectory ID and check for thumbnail
-        trajectory_id = self._get_file_id(str(file_path.relative_to(self.trajectories_dir)))
-        thumbnail_path = self._find_thumbnail(trajectory_id, "trajectories")
+        trajectory_id = self._get_file_id(rel_path)
+        self._index_id("trajectories", trajectory_id, file_path)
+        thumbnail_path, thumbnail_version = self._find_thumbnail(trajectory_id, "trajectories")
 
         return TrajectoryMetadata(
             id=trajectory_id,
-            filename=filename,
+            filename=file_path.name,
             category=category,
             file_size=stat.st_size,
             upload_date=datetime.fromtimestamp(stat.st_mtime),
             frame_count=frame_count,
             frame_rate=frame_rate,
             num_joints=num_joints,
-            thumbnail_path=thumbnail_path
+            thumbnail_path=thumbnail_path,
+            thumbnail_version=thumbnail_version
         )
 
     def delete_trajectory(self, trajectory_id: str) -> bool:
         """Delete a trajectory file."""
         file_path = self.get_trajectory(trajectory_id)
-        if file_path and file_path.exists():
+        if not file_path:
+            return False
+        # get_trajectory already checked the file; a concurrent delete shows up here
+        try:
             file_path.unlink()
-            return True
-        return False
+        except FileNotFoundError:
+            return False
+        self._forget_stat(file_path)
+        self._forget_meta(str(file_path.relative_to(self.trajectories_dir)))
+        self._invalidate_listing("trajectories")
+        self._index_id("trajectories", trajectory_id, None)
+        return True
 
     def list_models(self) -> List[ModelMetadata]:
         """List main model files (excluding component files in subdirectories)."""
-        models = []
+        models = self._cached_listing(
+            "models",
+            (self.models_dir, self.thumbnails_dir / "models"),
+            self._scan_models
+        )
+        return list(models)
 
-        # Scan for model directories and their main XML files
-        # Only include XML files that are direct children of model directories
-        for item in self.models_dir.iterdir():
-            if item.is_dir():
-                # This is a model directory (e.g., MS-Human-700)
-                model_dir = item
-
-                # Find XML files directly in this model directory (not in subdirs)
-                for xml_file in model_dir.glob('*.xml'):
-                    if xml_file.is_file():
-                        stat = xml_file.stat()
-                        rel_path = xml_file.relative_to(self.models_dir)
-
-                        # Get model ID and check for thumbnail
-                        model_id = self._get_file_id(str(rel_path))
-                        thumbnail_path = self._find_thumbnail(model_id, "models")
-
-                        models.append(ModelMetadata(
-                            id=model_id,
-                            filename=xml_file.name,
-                            model_name=model_dir.name,  # e.g., "MS-Human-700"
-                            relative_path=str(rel_path),
-                            file_size=stat.st_size,
-                            upload_date=datetime.fromtimestamp(stat.st_mtime),
-                            thumbnail_path=thumbnail_path
-                        ))
-            elif item.suffix == '.xml':
-                # XML file directly in models/ root (for backward compatibility)
-                stat = item.stat()
-
-                # Get model ID and check for thumbnail
-                model_id = self._get_file_id(item.name)
-                thumbnail_path = self._find_thumbnail(model_id, "models")
-
-                models.append(ModelMetadata(
-                    id=model_id,
-                    filename=item.name,
-                    model_name=None,
-                    relative_path=item.name,
-                    file_size=stat.st_size,
-                    upload_date=datetime.fromtimestamp(stat.st_mtime),
-                    thumbnail_path=thumbnail_path
-                ))
+    def _iter_model_files(self) -> Iterator[Tuple[Optional[str], os.DirEntry]]:
+        """Yield (model directory name, entry) for every main model file.
+
+        Only XML files that are direct children of a model directory (e.g.
+        MS-Human-700/) count; files in the models/ root are kept for backward
+        compatibility and yield None as their directory name.
+        """
+        with os.scandir(self.models_dir) as items:
+            for item in items:
+                if item.is_dir():
+                    # This is a model directory (e.g., MS-Human-700); component
+                    # files in its subdirectories are not models themselves
+                    with os.scandir(item.path) as model_files:
+                        for entry in model_files:
+                            if os.path.splitext(entry.name)[1].lower() in MODEL_EXTENSIONS and entry.is_file():
+                                yield item.name, entry
+                elif os.path.splitext(item.name)[1].lower() in MODEL_EXTENSIONS:
+                    yield None, item
+
+    def _scan_models(self) -> List[ModelMetadata]:
+        """Scan the models directory and build metadata for every main model file."""
+        models = []
+        thumbnails = self._build_thumbnail_index("models")
+
+        for model_name, entry in self._iter_model_files():
+            stat = entry.stat()
+            rel_path = os.path.join(model_name, entry.name) if model_name else entry.name
+
+            # Get model ID and check for thumbnail
+            model_id = self._get_file_id(rel_path)
+            thumbnail_path, thumbnail_version = self._find_thumbnail(model_id, "models", thumbnails)
+
+            models.append(ModelMetadata(
+                id=model_id,
+                filename=entry.name,
+                model_name=model_name,  # e.g., "MS-Human-700"
+                relative_path=rel_path,
+                file_size=stat.st_size,
+                upload_date=datetime.fromtimestamp(stat.st_mtime),
+                thumbnail_path=thumbnail_path,
+                thumbnail_version=thumbnail_version
+            ))
 
         return sorted(models, key=lambda x: x.upload_date, reverse=True)
 
     def get_model(self, model_id: str) -> Optional[Path]:
         """Get model file path by ID."""
-        # Check model directories
-        for item in self.models_dir.iterdir():
-            if item.is_dir():
-                for xml_file in item.glob('*.xml'):
-                    rel_path = xml_file.relative_to(self.models_dir)
-                    if self._get_file_id(str(rel_path)) == model_id:
-                        return xml_file
-            elif item.suffix == '.xml':
-                if self._get_file_id(item.name) == model_id:
-                    return item
-        return None
+        return self._lookup_id("models", model_id, self._build_model_index)
 
-    def save_model(self, filename: str, content: bytes, model_name: Optional[str] = None) -> ModelMetadata:
-        """Save a model file."""
-        if model_name:
-            # Save in a model directory
-            model_dir = self.models_dir / model_name
-            model_dir.mkdir(parents=True, exist_ok=True)
-            file_path = model_dir / filename
-        else:
-            # Save directly in models root
-            file_path = self.models_dir / filename
+    def _build_model_index(self) -> dict:
+        """Scan the models directory once and map every model file ID to its path."""
+        return {
+            self._get_file_id(os.path.join(model_name, entry.name) if model_name else entry.name): Path(entry.path)
+            for model_name, entry in self._iter_model_files()
+        }
+
+    def model_path(self, filename: str, model_name: Optional[str] = None) -> Path:
+        """Return the destination path for a model file, creating its model directory.
 
-        file_path.write_bytes(content)
-        stat = file_path.stat()
-        rel_path = file_path.relative_to(self.models_dir)
+        Models live in the root or one directory deep, so model_name must be
+        a single path component.
+
+        Raises:
+            UnsafePathError: If the filename or model name would leave models_dir
+        """
+        if model_name:
+            self._check_name(model_name, "model name")
+        return self._upload_destination(self.models_dir, model_name, filename)
+
+    def save_model(self, filename: str, source: BinaryIO, model_name: Optional[str] = None) -> ModelMetadata:
+        """Save a model file streamed from a file-like object."""
+        file_path = self.model_path(filename, model_name)
+        self._write_stream(file_path, source)
+        return self.register_model(file_path, model_name)
+
+    def register_model(self, file_path: Path, model_name: Optional[str] = None) -> ModelMetadata:
+        """Refresh caches for a newly written model file and return its metadata."""
+        self._forget_stat(file_path)
+        self._invalidate_listing("models")
+        stat = os.stat(file_path)
+        rel_path = str(file_path.relative_to(self.models_dir))
 
         # Get model ID and check for thumbnail
-        model_id = self._get_file_id(str(rel_path))
-        thumbnail_path = self._find_thumbnail(model_id, "models")
+        model_id = self._get_file_id(rel_path)
+        self._index_id("models", model_id, file_path)
+        thumbnail_path, thumbnail_version = self._find_thumbnail(model_id, "models")
 
         return ModelMetadata(
             id=model_id,
-            filename=filename,
+            filename=file_path.name,
             model_name=model_name,
-            relative_path=str(rel_path),
+            relative_path=rel_path,
             file_size=stat.st_size,
             upload_date=datetime.fromtimestamp(stat.st_mtime),
-            thumbnail_path=thumbnail_path
+            thumbnail_path=thumbnail_path,
+            thumbnail_version=thumbnail_version
         )
 
     def delete_model(self, model_id: str) -> bool:
         """Delete a model file."""
         file_path = self.get_model(model_id)
-        if file_path and file_path.exists():
+        if not file_path:
+            return False
+        # get_model already checked the file; a concurrent delete shows up here
+        try:
             file_path.unlink()
-            return True
-        return False
+        except FileNotFoundError:
+            return False
+        self._forget_stat(file_path)
+        self._invalidate_listing("models")
+        self._index_id("models", model_id, None)
+        return True
 
     def get_model_directory_files(self, model_id: str) -> List[str]:
         """Get all files in a model's directory tree (relative paths)."""
@@ -289,13 +797,14 @@ class StorageManager:
             return [main_model_path.name]
         else:
             # Model in a subdirectory, return all files in that directory tree
-            model_dir = main_model_path.parent
+            # os.walk already splits files from directories, so no per-entry
+            # stat or Path objects are needed
+            models_root = str(self.models_dir)
             files = []
 
-            for file_path in model_dir.rglob('*'):
-                if file_path.is_file():
-                    rel_path = file_path.relative_to(self.models_dir)
-                    files.append(str(rel_path))
+            for root, _, filenames in os.walk(main_model_path.parent):
+                rel_root = os.path.relpath(root, models_root)
+                files.extend(os.path.join(rel_root, name) for name in filenames)
 
             return files
 
@@ -308,15 +817,17 @@ class StorageManager:
         # Construct absolute path
         requested_file = self.models_dir / file_relative_path
 
-        # Security check: ensure file is within models directory
-        try:
-            requested_file.resolve().relative_to(self.models_dir.resolve())
-        except ValueError:
+        # Security check: ensure file is within models directory. models_dir
+        # is already resolved (settings.models_path), so only the requested
+        # path needs resolving, and only once
+        resolved_file = os.path.realpath(requested_file)
+        models_root = str(self.models_dir)
+        if os.path.commonpath((resolved_file, models_root)) != models_root:
             # Path is outside models directory
             return None
 
-        # Check if file exists
-        if not requested_file.exists() or not requested_file.is_file():
+        # Check if file exists (is_file is False for missing paths)
+        if not requested_file.is_file():
             return None
 
         # Verify it's in the same model directory
@@ -326,12 +837,9 @@ class StorageManager:
                 return requested_file
         else:
             # Multi-file model - allow any file in the model directory
-            model_dir = main_model_path.parent
-            try:
-                requested_file.resolve().relative_to(model_dir.resolve())
+            model_dir = os.path.realpath(main_model_path.parent)
+            if os.path.commonpath((resolved_file, model_dir)) == model_dir:
                 return requested_file
-            except ValueError:
-                return None
 
         return None
 
@@ -344,22 +852,13 @@ class StorageManager:
         Returns:
             Path to thumbnail file if it exists, None otherwise
         """
-        print(f"[STORAGE] Looking for model thumbnail: model_id={model_id}")
-        thumbnail_dir = self.thumbnails_dir / "models"
-        print(f"[STORAGE] Search directory: {thumbnail_dir}")
-        print(f"[STORAGE] Directory exists: {thumbnail_dir.exists()}")
-
-        # Search recursively for thumbnail (thumbnails mirror directory structure)
-        for ext in ['.webp', '.png', '.jpg', '.gif']:
-            matches = list(thumbnail_dir.rglob(f"{model_id}{ext}"))
-            if matches:
-                print(f"[STORAGE] Found {len(matches)} match(es) for {model_id}{ext}: {matches}")
-                return matches[0]
-            else:
-                print(f"[STORAGE] No matches for pattern: {model_id}{ext}")
-
-        print(f"[STORAGE] Model thumbnail not found after checking all extensions")
-        return None
+        # Thumbnails mirror the source directory structure; one walk covers
+        # every extension
+        match = self._scan_for_thumbnail(self.thumbnails_dir / "models", model_id)
+        if match is None:
+            print(f"[STORAGE] Model thumbnail not found: model_id={model_id}")
+            return None
+        return Path(match[1].path)
 
     def get_trajectory_thumbnail(self, trajectory_id: str) -> Optional[Path]:
         """Get thumbnail path for a trajectory by ID.
@@ -370,22 +869,13 @@ class StorageManager:
         Returns:
             Path to thumbnail file if it exists, None otherwise
         """
-        print(f"[STORAGE] Looking for trajectory thumbnail: trajectory_id={trajectory_id}")
-        thumbnail_dir = self.thumbnails_dir / "trajectories"
-        print(f"[STORAGE] Search directory: {thumbnail_dir}")
-        print(f"[STORAGE] Directory exists: {thumbnail_dir.exists()}")
-
-        # Search recursively for thumbnail (thumbnails mirror directory structure)
-        for ext in ['.webp', '.png', '.jpg', '.gif']:
-            matches = list(thumbnail_dir.rglob(f"{trajectory_id}{ext}"))
-            if matches:
-                print(f"[STORAGE] Found {len(matches)} match(es) for {trajectory_id}{ext}: {matches}")
-                return matches[0]
-            else:
-                print(f"[STORAGE] No matches for pattern: {trajectory_id}{ext}")
-
-        print(f"[STORAGE] Trajectory thumbnail not found after checking all extensions")
-        return None
+        # Thumbnails mirror the source directory structure; one walk covers
+        # every extension
+        match = self._scan_for_thumbnail(self.thumbnails_dir / "trajectories", trajectory_id)
+        if match is None:
+            print(f"[STORAGE] Trajectory thumbnail not found: trajectory_id={trajectory_id}")
+            return None
+        return Path(match[1].path)
 
 
 # Global storage manager instance
@@ -0,0 +1,46 @@
+import os
+import tempfile
+
+import pytest
+
+# config.Settings requires these, and importing storage creates the global
+# StorageManager under DATA_DIR, so point everything at a scratch directory
+# before any backend module is imported
+_session_dir = tempfile.mkdtemp(prefix="motion-library-tests-")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ADMIN_PASSWORD", "test-password")
+os.environ["DATA_DIR"] = _session_dir
+os.environ["MODELS_DIR"] = os.path.join(_session_dir, "models")
+os.environ["TRAJECTORIES_DIR"] = os.path.join(_session_dir, "trajectories")
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """A StorageManager rooted in a fresh per-test data directory."""
+    import storage as storage_module
+    from config import settings
+
+    # The resolved paths are cached_property values in the instance dict
+    monkeypatch.setitem(settings.__dict__, "data_path", tmp_path)
+    monkeypatch.setitem(settings.__dict__, "models_path", tmp_path / "models")
+    monkeypatch.setitem(settings.__dict__, "trajectories_path", tmp_path / "trajectories")
+
+    manager = storage_module.StorageManager()
+    monkeypatch.setattr(storage_module, "storage", manager)
+    return manager
+
+
+@pytest.fixture
+def client(storage, monkeypatch):
+    """A TestClient for the app, authenticated and backed by `storage`."""
+    from fastapi.testclient import TestClient
+    import main
+    from auth import get_current_user
+
+    monkeypatch.setattr(main, "storage", storage)
+    main.app.dependency_overrides[get_current_user] = lambda: "admin"
+    try:
+        with TestClient(main.app) as test_client:
+            yield test_client
+    finally:
+        main.app.dependency_overrides.clear()
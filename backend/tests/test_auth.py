@@ -0,0 +1,107 @@
+import base64
+import json
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import JWTError, jwt
+
+from auth import _decode_hs256, create_access_token, verify_token
+from config import settings
+
+
+def _token(claims: dict, key: str = None, algorithm: str = "HS256") -> str:
+    return jwt.encode(claims, key or settings.SECRET_KEY, algorithm=algorithm)
+
+
+def _segment(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def _verify(token: str):
+    return verify_token(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+def test_valid_token_is_accepted():
+    token = create_access_token({"sub": "admin"})
+
+    assert _decode_hs256(token)["sub"] == "admin"
+    assert _verify(token).username == "admin"
+
+
+def test_tampered_signature_is_rejected():
+    token = _token({"sub": "admin", "exp": time.time() + 60})
+    signing_input, _, signature = token.rpartition(".")
+    tampered = signing_input + "." + ("A" if signature[0] != "A" else "B") + signature[1:]
+
+    with pytest.raises(JWTError):
+        _decode_hs256(tampered)
+
+
+def test_tampered_payload_is_rejected():
+    token = _token({"sub": "admin", "exp": time.time() + 60})
+    header, _, signature = token.split(".")
+    forged = ".".join((header, _segment({"sub": "root", "exp": time.time() + 60}), signature))
+
+    with pytest.raises(JWTError):
+        _decode_hs256(forged)
+
+
+def test_wrong_key_is_rejected():
+    with pytest.raises(JWTError):
+        _decode_hs256(_token({"sub": "admin"}, key="not-the-secret"))
+
+
+@pytest.mark.parametrize("algorithm", ["HS384", "HS512"])
+def test_other_algorithms_are_rejected(algorithm):
+    with pytest.raises(JWTError):
+        _decode_hs256(_token({"sub": "admin"}, algorithm=algorithm))
+
+
+def test_alg_none_is_rejected():
+    token = ".".join((_segment({"alg": "none", "typ": "JWT"}), _segment({"sub": "admin"}), ""))
+
+    with pytest.raises(JWTError):
+        _decode_hs256(token)
+
+
+def test_expired_token_is_rejected():
+    with pytest.raises(JWTError):
+        _decode_hs256(_token({"sub": "admin", "exp": int(time.time()) - 10}))
+
+
+def test_future_nbf_is_rejected():
+    with pytest.raises(JWTError):
+        _decode_hs256(_token({"sub": "admin", "nbf": int(time.time()) + 60}))
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "only.two",
+    "too.many.dots.here",
+    "!!!.###.$$$",
+    "e30.e30.%%%",
+    _segment({"alg": "HS256"}) + ".bm90IGpzb24." + "c2ln",
+])
+def test_malformed_tokens_are_rejected(token):
+    with pytest.raises(JWTError):
+        _decode_hs256(token)
+
+
+@pytest.mark.parametrize("claims", [
+    {"sub": 123},
+    {"sub": ["admin"]},
+    {"sub": "admin", "aud": "someone-else"},
+    {"sub": "admin", "jti": 5},
+    {"sub": "admin", "iat": "yesterday"},
+])
+def test_bad_claims_are_rejected(claims):
+    token = _token(claims)
+
+    with pytest.raises(JWTError):
+        _decode_hs256(token)
+    # A correctly signed token with bad claims is a 401, not a server error
+    with pytest.raises(HTTPException) as excinfo:
+        _verify(token)
+    assert excinfo.value.status_code == 401
@@ -0,0 +1,30 @@
+import os
+
+from storage import file_id
+
+
+def test_replaced_file_is_served_with_its_current_length(client, storage):
+    path = storage.trajectories_dir / "walk.npy"
+    path.write_bytes(b"old data")
+    url = f"/api/trajectories/{file_id('walk.npy')}"
+
+    first = client.get(url)
+    assert first.content == b"old data"
+
+    # Replace it while the first stat is still cached
+    replacement = path.with_name("walk.npy.new")
+    replacement.write_bytes(b"new contents")
+    os.replace(replacement, path)
+
+    second = client.get(url)
+    assert second.content == b"new contents"
+    assert second.headers["content-length"] == str(len(b"new contents"))
+
+
+def test_conditional_request_gets_304(client, storage):
+    (storage.trajectories_dir / "walk.npy").write_bytes(b"data")
+    url = f"/api/trajectories/{file_id('walk.npy')}"
+
+    etag = client.get(url).headers["etag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,103 @@
+import io
+import os
+import threading
+import time
+
+import numpy as np
+import orjson
+
+from storage import StorageManager, file_id
+
+
+def test_walk_skips_symlink_loops(storage):
+    category = storage.trajectories_dir / "loco"
+    category.mkdir()
+    np.save(category / "walk.npy", np.zeros((5, 3)))
+    # A link back up the tree would recurse forever if followed
+    os.symlink(storage.trajectories_dir, category / "loop")
+
+    files = [os.path.join(rel_dir, entry.name) for rel_dir, entry in storage._iter_trajectory_files()]
+
+    assert files == [os.path.join("loco", "walk.npy")]
+    assert storage.get_trajectory(file_id(os.path.join("loco", "walk.npy"))) == category / "walk.npy"
+
+
+def test_listing_survives_symlink_loops(storage):
+    np.save(storage.trajectories_dir / "walk.npy", np.zeros((5, 3)))
+    os.symlink(storage.trajectories_dir, storage.trajectories_dir / "loop")
+    os.symlink(storage.thumbnails_dir, storage.thumbnails_dir / "trajectories" / "loop")
+
+    assert [t.filename for t in storage.list_trajectories()] == ["walk.npy"]
+    # Served from the cache the second time; the signature walk must not loop either
+    assert [t.filename for t in storage.list_trajectories()] == ["walk.npy"]
+
+
+def _make_trajectories(storage, count):
+    for i in range(count):
+        np.save(storage.trajectories_dir / f"t{i}.npy", np.zeros((i + 1, 3)))
+
+
+def test_stream_yields_before_parsing_everything(storage, monkeypatch):
+    _make_trajectories(storage, 40)
+    parsed = []
+    parse = storage._parse_trajectory_file
+    monkeypatch.setattr(storage, "_parse_trajectory_file", lambda *args: parsed.append(args) or parse(*args))
+
+    stream = storage.iter_trajectories()
+    next(stream)
+
+    assert len(parsed) == 1
+    assert len(list(stream)) == 39
+
+
+def test_scan_prefetches_uncached_metadata(storage):
+    _make_trajectories(storage, 40)
+
+    trajectories = storage.list_trajectories()
+
+    assert sorted(t.frame_count for t in trajectories) == list(range(1, 41))
+    assert len(storage._meta_cache) == 40
+
+
+def _npy_bytes(frames):
+    buffer = io.BytesIO()
+    np.save(buffer, np.zeros((frames, 3)))
+    return buffer.getvalue()
+
+
+def test_overwriting_upload_refreshes_other_workers_listing(storage):
+    storage.save_trajectory("walk.npy", io.BytesIO(_npy_bytes(5)))
+    # A second manager stands in for another worker with its own caches
+    other_worker = StorageManager()
+    assert other_worker.list_trajectories()[0].frame_count == 5
+
+    time.sleep(0.05)  # Step past the filesystem's timestamp granularity
+    storage.save_trajectory("walk.npy", io.BytesIO(_npy_bytes(9)))
+
+    assert other_worker.list_trajectories()[0].frame_count == 9
+    assert [p.name for p in storage.trajectories_dir.iterdir()] == ["walk.npy"]
+
+
+def test_concurrent_meta_cache_saves_stay_valid(storage):
+    np.save(storage.trajectories_dir / "walk.npy", np.zeros((5, 3)))
+    storage.list_trajectories()
+    errors = []
+
+    def save_repeatedly():
+        for _ in range(200):
+            with storage._meta_cache_lock:
+                storage._meta_cache_dirty = True
+            storage._save_meta_cache()
+            try:
+                orjson.loads(storage._meta_cache_path.read_bytes())
+            except orjson.JSONDecodeError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=save_repeatedly) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [p.name for p in storage.base_path.iterdir() if p.suffix == ".tmp"] == []
@@ -0,0 +1,45 @@
+import time
+
+import numpy as np
+from PIL import Image
+
+from scripts.generate_thumbnails import ThumbnailGenerator, save_image
+from storage import file_id
+
+
+def test_regenerated_thumbnail_changes_listed_version(storage):
+    np.save(storage.trajectories_dir / "walk.npy", np.zeros((5, 3)))
+    thumbnail = storage.thumbnails_dir / "trajectories" / f"{file_id('walk.npy')}.webp"
+
+    save_image(Image.new("RGB", (4, 4)), thumbnail, "WEBP")
+    before = storage.list_trajectories()[0].thumbnail_version
+    assert before is not None
+
+    # Step past the filesystem's timestamp granularity so the directory
+    # mtime can move
+    time.sleep(0.05)
+    save_image(Image.new("RGB", (4, 4), "red"), thumbnail, "WEBP")
+    after = storage.list_trajectories()[0].thumbnail_version
+
+    assert after is not None
+    assert after != before
+    assert not thumbnail.with_name(thumbnail.name + ".tmp").exists()
+
+
+def test_thumbnail_is_stale_after_switching_models(tmp_path):
+    generator = ThumbnailGenerator(tmp_path)
+    generator.models_dir.mkdir()
+    (generator.models_dir / "a.xml").write_text("<mujoco/>")
+    (generator.models_dir / "b.xml").write_text("<mujoco/>")
+    trajectory = generator.trajectories_dir / "walk.npy"
+    trajectory.parent.mkdir()
+    np.save(trajectory, np.zeros((5, 3)))
+
+    # Rendered with a.xml after both models were last modified
+    output_path = generator.trajectory_thumbnail_path(trajectory)
+    save_image(Image.new("RGB", (4, 4)), output_path, "WEBP")
+    generator.write_render_params(output_path, generator.render_params("a.xml"))
+    inputs = [generator.models_dir / "b.xml", trajectory]
+
+    assert generator.is_up_to_date(output_path, inputs, generator.render_params("a.xml"))
+    assert not generator.is_up_to_date(output_path, inputs, generator.render_params("b.xml"))
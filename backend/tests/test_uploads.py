@@ -0,0 +1,84 @@
+from config import settings
+
+
+def _chunked(total: int, chunk_size: int = 64 * 1024):
+    """Yield a body of `total` bytes; a generator body is sent chunked."""
+    for start in range(0, total, chunk_size):
+        yield b"\0" * min(chunk_size, total - start)
+
+
+def test_chunked_put_over_limit_is_rejected(client, storage, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE_MB", 1)
+
+    response = client.put("/api/trajectories/big.npy", content=_chunked(3 * 1024 * 1024))
+
+    assert response.status_code == 413
+    assert not (storage.trajectories_dir / "big.npy").exists()
+    assert not (storage.trajectories_dir / "big.npy.part").exists()
+
+
+def test_multipart_post_over_limit_is_rejected(client, storage, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE_MB", 1)
+    boundary = "test-boundary"
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="big.npy"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    def body():
+        yield head
+        yield from _chunked(3 * 1024 * 1024)
+        yield tail
+
+    # Sent chunked, so there is no Content-Length to check up front
+    response = client.post(
+        "/api/trajectories",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+    assert response.status_code == 413
+    assert not (storage.trajectories_dir / "big.npy").exists()
+
+
+def test_put_outside_data_dir_is_rejected(client, storage):
+    response = client.put("/api/trajectories/y.npy?category=../../escape", content=b"data")
+
+    assert response.status_code == 400
+    assert not (storage.base_path.parent / "escape").exists()
+
+
+def test_model_name_with_separator_is_rejected(client, storage):
+    response = client.put("/api/models/m.xml?model_name=a/b", content=b"<mujoco/>")
+
+    assert response.status_code == 400
+    assert not (storage.models_dir / "a").exists()
+
+
+def test_multipart_filename_with_separator_is_rejected(client, storage):
+    response = client.post(
+        "/api/trajectories",
+        files={"file": ("../y.npy", b"data", "application/octet-stream")},
+    )
+
+    assert response.status_code == 400
+    assert not (storage.base_path / "y.npy").exists()
+
+
+def test_symlinked_category_out_of_root_is_rejected(client, storage, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("outside")
+    (storage.trajectories_dir / "linked").symlink_to(outside)
+
+    response = client.put("/api/trajectories/y.npy?category=linked", content=b"data")
+
+    assert response.status_code == 400
+    assert not (outside / "y.npy").exists()
+
+
+def test_nested_category_is_accepted(client, storage):
+    response = client.put("/api/trajectories/y.npy?category=loco/run", content=b"data")
+
+    assert response.status_code == 200
+    assert (storage.trajectories_dir / "loco" / "run" / "y.npy").exists()
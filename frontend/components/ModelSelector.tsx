@@ -36,7 +36,7 @@ export default function ModelSelector({ onModelSelect, selectedModelId }: ModelS
         if (model.thumbnail_path) {
           try {
             console.log('[MODEL SELECTOR] Preloading thumbnail for:', model.id, model.filename);
-            const blob = await modelApi.getThumbnail(model.id);
+            const blob = await modelApi.getThumbnail(model.id, model.thumbnail_version);
             const blobUrl = URL.createObjectURL(blob);
             urlMap.set(model.id, blobUrl);
             console.log('[MODEL SELECTOR] Thumbnail preloaded:', model.id);
@@ -159,7 +159,7 @@ export default function TrajectorySelector({
       if (trajectory.thumbnail_path && !urlMap.has(trajectory.id)) {
         try {
           console.log('[TRAJECTORY SELECTOR] Preloading thumbnail for:', trajectory.id, trajectory.filename);
-          const blob = await trajectoryApi.getThumbnail(trajectory.id);
+          const blob = await trajectoryApi.getThumbnail(trajectory.id, trajectory.thumbnail_version);
           const blobUrl = URL.createObjectURL(blob);
           urlMap.set(trajectory.id, blobUrl);
           console.log('[TRAJECTORY SELECTOR] Thumbnail preloaded:', trajectory.id);
@@ -71,6 +71,7 @@ export interface TrajectoryMetadata {
   frame_rate?: number;
   num_joints?: number;
   thumbnail_path?: string;
+  thumbnail_version?: string;
 }
 
 export interface ModelMetadata {
@@ -81,6 +82,7 @@ export interface ModelMetadata {
   file_size: number;
   upload_date: string;
   thumbnail_path?: string;
+  thumbnail_version?: string;
 }
 
 // Auth API
@@ -95,6 +97,10 @@ export const authApi = {
   },
 };
 
+// Files larger than this are sent as a raw request body to the streaming
+// PUT endpoints instead of as multipart form data
+const STREAMING_UPLOAD_THRESHOLD = 10 * 1024 * 1024; // 10 MB
+
 // Trajectory API
 export const trajectoryApi = {
   list: async (category?: string): Promise<{ trajectories: TrajectoryMetadata[]; total: number }> => {
@@ -108,6 +114,15 @@ export const trajectoryApi = {
     return response.data;
   },
   upload: async (file: File, category?: string): Promise<any> => {
+    if (file.size > STREAMING_UPLOAD_THRESHOLD) {
+      const response = await api.put(`/api/trajectories/${encodeURIComponent(file.name)}`, file, {
+        params: { category },
+        headers: {
+          'Content-Type': 'application/octet-stream',
+        },
+      });
+      return response.data;
+    }
     const formData = new FormData();
     formData.append('file', file);
     if (category) {
@@ -123,8 +138,11 @@ export const trajectoryApi = {
   delete: async (id: string): Promise<void> => {
     await api.delete(`/api/trajectories/${id}`);
   },
-  getThumbnail: async (id: string): Promise<Blob> => {
+  // Passing the listing's thumbnail_version makes the URL unique per
+  // thumbnail revision, so the browser may cache it indefinitely
+  getThumbnail: async (id: string, version?: string): Promise<Blob> => {
     const response = await api.get(`/api/trajectories/${id}/thumbnail`, {
+      params: { v: version },
       responseType: 'blob',
     });
     return response.data;
@@ -144,6 +162,14 @@ export const modelApi = {
     return response.data;
   },
   upload: async (file: File): Promise<any> => {
+    if (file.size > STREAMING_UPLOAD_THRESHOLD) {
+      const response = await api.put(`/api/models/${encodeURIComponent(file.name)}`, file, {
+        headers: {
+          'Content-Type': 'application/octet-stream',
+        },
+      });
+      return response.data;
+    }
     const formData = new FormData();
     formData.append('file', file);
     const response = await api.post('/api/models', formData, {
@@ -168,8 +194,9 @@ export const modelApi = {
     });
     return response.data;
   },
-  getThumbnail: async (id: string): Promise<Blob> => {
+  getThumbnail: async (id: string, version?: string): Promise<Blob> => {
     const response = await api.get(`/api/models/${id}/thumbnail`, {
+      params: { v: version },
       responseType: 'blob',
     });
     return response.data;